@@ -1,13 +1,36 @@
-from fastapi import APIRouter, WebSocket
+from fastapi import APIRouter, WebSocket, Query, Request, Depends
+from fastapi.responses import StreamingResponse
 from starlette.websockets import WebSocketState
 import os
-import openai
+import io
+import json
+import asyncio
+import logging
+import time
 import uuid
-import subprocess
+from typing import Optional
 from dotenv import load_dotenv
-from minio import Minio
-from celery_app import celery_app
-from celery import shared_task
+from celery import shared_task, current_app
+from app.tasks.celery_app import route_recording, queue_depths, MAX_PRIORITY
+from app.utils.storage import get_minio_client, open_object, MINIO_BUCKET_NAME
+from app.utils.ingest import SpoolWriter, MinioStreamWriter
+from app.utils.live import LiveSegmenter
+from app.utils.sessions import (
+    RecordingSession, SessionRegistry, CHUNK_HEADER, AUDIO_SESSION_SWEEP_INTERVAL,
+    expired_sessions, load_meta, last_activity, session_path, session_exists, remove_session_files,
+)
+from app.utils.audio import pcm_to_wav
+from app.utils.stt_cache import cache_stats
+from app.utils.verification import get_current_user
+from app.utils.stt import transcribe
+from app.utils.conversations import save_transcript_segments
+from app.utils.logging_config import LogSampler
+from app.utils.job_events import (
+    publish_job_event, get_job_event_hub, task_result_event, TERMINAL_STAGES,
+)
+from app.utils.metrics import (
+    track_stage, AUDIO_BYTES_INGESTED, WEBSOCKET_SESSIONS, WEBSOCKET_SESSIONS_TOTAL,
+)
 
 # Docker 환경인지 확인
 IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
@@ -15,6 +38,8 @@ IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
 if not IS_DOCKER:
     load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
 
+logger = logging.getLogger(__name__)
+
 # APIRouter 생성
 audio_router = APIRouter()
 
@@ -22,136 +47,503 @@ audio_router = APIRouter()
 SAVE_PATH = "./recordings"
 os.makedirs(SAVE_PATH, exist_ok=True)
 
-# OpenAI API 키 설정 (환경 변수에서 로드)
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-# MinIO 설정
-MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT")
-MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
-MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
-MINIO_BUCKET_NAME = os.getenv("MINIO_BUCKET_NAME")
+# 스트리밍 수신 설정
+# spool: 로컬 append-only 파일에 기록 후 MinIO 업로드, minio: MinIO 멀티파트 업로드로 바로 전송
+AUDIO_INGEST_MODE = os.getenv("AUDIO_INGEST_MODE", "spool").lower()
+# 연결당 메모리에 유지할 최대 버퍼 크기 (바이트)
+AUDIO_INGEST_BUFFER_SIZE = int(os.getenv("AUDIO_INGEST_BUFFER_SIZE", str(1024 * 1024)))
+# live 모드에서 녹음 중 잘라서 전사할 세그먼트 길이 (초)
+LIVE_SEGMENT_SECONDS = float(os.getenv("LIVE_SEGMENT_SECONDS", "15"))
+# live 모드에서 세그먼트 하나의 전사 결과를 기다리는 최대 시간 (초), 넘으면 실패로 처리
+LIVE_SEGMENT_TIMEOUT = float(os.getenv("LIVE_SEGMENT_TIMEOUT", "120"))
+# 프레임 수신 로그는 연결당 이 간격(초)에 한 번만 남김
+FRAME_LOG_INTERVAL = float(os.getenv("FRAME_LOG_INTERVAL", "5"))
 
-minio_client = Minio(
-    MINIO_ENDPOINT.replace("http://", "").replace("https://", ""),  # 프로토콜 제거
-    access_key=MINIO_ACCESS_KEY,
-    secret_key=MINIO_SECRET_KEY,
-    secure=False
-)
+def transcribe_audio(audio_data, file_name):
+    """
+    Whisper API를 사용해 WAV 오디오 바이트를 텍스트로 변환
+    실패하면 예외를 그대로 올려 작업이 실패로 끝나게 함 (빈 구간이 있는 회의록을 성공으로 저장하지 않음)
+    """
+    try:
+        return transcribe(audio_data, file_name)
+    except Exception as e:
+        logger.error(f"❌ Error during transcription: {e}", extra={"file_name": file_name})
+        raise
 
-# MinIO 버킷 존재 확인 및 생성
-if not minio_client.bucket_exists(MINIO_BUCKET_NAME):
-    minio_client.make_bucket(MINIO_BUCKET_NAME)
+def open_ingest_writer(file_id):
+    """
+    AUDIO_INGEST_MODE에 맞는 스트리밍 writer 생성
+    """
+    if AUDIO_INGEST_MODE == "minio":
+        return MinioStreamWriter(
+            get_minio_client(), MINIO_BUCKET_NAME, f"{file_id}.webm", AUDIO_INGEST_BUFFER_SIZE
+        )
+    return SpoolWriter(os.path.join(SAVE_PATH, f"{file_id}.webm"), AUDIO_INGEST_BUFFER_SIZE)
 
-def convert_webm_to_wav(input_path, output_path):
+@shared_task(acks_late=True)
+def process_audio_task(file_id, meeting_id=None):
     """
-    ffmpeg를 사용하여 WebM 파일을 PCM 16bit 44.1kHz WAV 파일로 변환
+    업로드된 녹음(MinIO의 WebM)을 전사하는 작업, 처리 과정은 워커 모듈의 run_transcription과 같음
+    이 작업은 워커에서만 실행되므로 워커 모듈은 여기서 import (API 프로세스에서는 불러오지 않음)
     """
-    command = [
-        "ffmpeg", "-y", "-i", input_path, "-acodec", "pcm_s16le", "-ac", "1", "-ar", "44100", output_path
-    ]
-    try:
-        subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        print(f"✅ Converted WebM to WAV: {output_path}")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error converting WebM to WAV: {e}")
+    from app.tasks.tasks import run_transcription
+
+    return run_transcription(file_id, meeting_id)
 
-def transcribe_audio(audio_path):
+@shared_task
+def transcribe_segment_task(object_name):
     """
-    Whisper API를 사용해 오디오 파일을 텍스트로 변환
+    live 모드에서 업로드된 WAV 세그먼트 하나를 MinIO에서 받아 텍스트로 변환
+    세그먼트 객체는 전사용 임시 데이터이므로 전사에 성공한 뒤에만 삭제 (실패/재전달 시 다시 읽을 수 있도록)
     """
+    with open_object(object_name) as response:
+        audio_data = response.read()
+
+    transcription = transcribe_audio(audio_data, os.path.basename(object_name))
     try:
-        with open(audio_path, "rb") as audio_file:
-            response = openai.Audio.transcribe(
-                model="whisper-1",
-                file=audio_file
-            )
-        return response.get("text", "")
+        get_minio_client().remove_object(MINIO_BUCKET_NAME, object_name)
     except Exception as e:
-        print(f"❌ Error during transcription: {e}")
-        return "Transcription failed."
+        # 전사 결과는 이미 나왔으므로 정리 실패로 작업을 실패시키지 않음
+        logger.warning(f"⚠️ Failed to remove live segment {object_name}: {e}", extra={"object_name": object_name})
+    return transcription
 
-def upload_to_minio(file_path, file_name):
+async def upload_spool_file(file_id, path):
     """
-    MinIO에 파일 업로드 후 로컬 파일 삭제
+    MinIO에 WebM 스풀 파일 업로드 (파일에서 스트리밍하므로 메모리 사용량 일정)
+    워커는 MinIO에서 스트리밍하므로 업로드가 끝난 스풀 파일은 바로 삭제
     """
-    try:
-        minio_client.fput_object(MINIO_BUCKET_NAME, file_name, file_path)
-        print(f"✅ Uploaded {file_name} to MinIO")
-        os.remove(file_path)
-        print(f"🗑️ Deleted local file: {file_path}")
-    except Exception as e:
-        print(f"❌ Error uploading to MinIO: {e}")
+    with track_stage("minio_upload"):
+        await asyncio.to_thread(
+            get_minio_client().fput_object, MINIO_BUCKET_NAME, f"{file_id}.webm", path
+        )
+    os.remove(path)
 
-@shared_task
-def process_audio_task(file_id):
-    webm_file_path = os.path.join(SAVE_PATH, f"{file_id}.webm")
-    wav_file_path = os.path.join(SAVE_PATH, f"{file_id}.wav")
+def submit_recording(file_id, meeting_id, recording_seconds):
+    """
+    녹음 길이에 맞는 큐/우선순위로 전사 작업 제출
+    진행 상황은 GET /audio_recording/jobs/{task_id}/events 로 구독
+    """
+    task = process_audio_task.apply_async((file_id, meeting_id), **route_recording(recording_seconds))
+    publish_job_event(task.id, "queued", file_id=file_id)
+    logger.info(
+        f"📤 Task {task.id} submitted to Celery.",
+        extra={"file_id": file_id, "task_id": task.id, "recording_seconds": round(recording_seconds, 1)}
+    )
+    return task
 
-    # WebM -> WAV 변환
-    convert_webm_to_wav(webm_file_path, wav_file_path)
+async def send_partial_transcripts(websocket, pending):
+    """
+    세그먼트 전사 결과를 세그먼트 순서대로 기다렸다가 WebSocket으로 전송
+    (offset, text) 목록과 실패한 세그먼트 수를 반환
+    """
+    transcripts = []
+    failed_segments = 0
+    while True:
+        item = await pending.get()
+        if item is None:
+            break
+        index, offset, result = item
+        error = "Segment dispatch failed" if result is None else None  # 세그먼트 업로드/제출 실패
+        text = ""
+        if error is None:
+            try:
+                # 결과가 오지 않는 작업(유실 등)에 전송 순서와 스레드가 묶이지 않도록 제한 시간을 둠
+                text = await asyncio.to_thread(result.get, timeout=LIVE_SEGMENT_TIMEOUT)
+            except Exception as e:
+                logger.error(f"❌ Segment {index} failed: {e!r}", extra={"index": index})
+                error = f"{type(e).__name__}: {e}"
+        if error is None:
+            transcripts.append((offset, text))
+        else:
+            failed_segments += 1
+        if websocket.client_state == WebSocketState.CONNECTED:
+            message = {"type": "partial", "index": index, "offset": offset, "text": text}
+            if error is not None:
+                message["failed"] = True
+                message["error"] = error
+            await websocket.send_json(message)
+    return transcripts, failed_segments
+
+async def finish_live_recording(file_id, meeting_id, transcripts):
+    """
+    live 모드 녹음 종료 처리: 세그먼트 전사 결과를 회의 대화 기록으로 저장하고
+    원본 WebM은 batch 전사와 같이 보관용 Opus로 바꾼 뒤 삭제 (archive_audio 작업)
+    """
+    if meeting_id is not None:
+        saved = await asyncio.to_thread(save_transcript_segments, meeting_id, transcripts, file_id)
+        logger.info(f"💾 Saved {saved} live conversation(s) for meeting {meeting_id}", extra={"file_id": file_id})
+        # 워커 모듈을 import 하지 않고 이름으로 제출
+        if saved:
+            current_app.send_task("app.tasks.tasks.extract_keywords", args=[meeting_id])
+    current_app.send_task("app.tasks.tasks.archive_audio", args=[file_id, meeting_id])
 
-    # Whisper API를 사용해 오디오를 텍스트로 변환
-    transcription = transcribe_audio(wav_file_path)
-    print(f"📝 Transcription: {transcription}")
+def format_sse(event):
+    return f"event: {event['stage']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
 
-    # WAV 파일 MinIO 업로드 및 삭제
-    upload_to_minio(wav_file_path, f"{file_id}.wav")
+@audio_router.get("/jobs/{task_id}/events")
+async def job_events(
+    task_id: str,
+    request: Request,
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수 (done 이벤트에 전사 결과가 포함됨)
+):
+    """
+    전사 작업의 진행 단계(queued, started, chunk, converted, saved, done/failed)를 Server-Sent Events로 전송
+    이미 지난 이벤트부터 보내며 done/failed 이벤트 후 스트림을 닫는다.
+    연결할 때 결과 저장소를 한 번 확인해 이미 끝난 작업(이벤트 기록이 없거나 종료 이벤트를 놓친 작업)은 바로 done/failed를 보내고,
+    그 뒤로는 이벤트 수신 경로로 들어오는 이벤트만 기다린다 (연결마다 결과 저장소를 폴링하지 않음).
+    JOB_EVENTS_STREAM_TIMEOUT이 지나면 timeout 이벤트를 보내고 닫는다.
+    """
+    hub = get_job_event_hub()
 
-    # WebM 파일 삭제
-    if os.path.exists(webm_file_path):
-        os.remove(webm_file_path)
-        print(f"🗑️ Deleted local file: {webm_file_path}")
+    async def stream():
+        terminal = await asyncio.to_thread(task_result_event, task_id)
+        if terminal is not None:
+            yield format_sse(terminal)
+            return
+        async for event in hub.subscribe(task_id):
+            if await request.is_disconnected():
+                return
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+            if event["stage"] in TERMINAL_STAGES:
+                return
+        yield format_sse({"task_id": task_id, "stage": "timeout"})
 
-    return transcription
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@audio_router.get("/queues")
+async def get_queue_depths(user_id: int = Depends(get_current_user)):  # 🔒 인증 필수
+    """
+    Celery 큐별 대기 메시지 수와 워커 수 (큐 대기 시간은 워커 /metrics의 stt_task_queue_wait_seconds)
+    """
+    return await asyncio.to_thread(queue_depths)
+
+@audio_router.get("/stt_cache")
+def get_stt_cache_stats(user_id: int = Depends(get_current_user)):  # 🔒 인증 필수
+    """
+    이 프로세스의 전사 캐시 적중/미스 통계
+    """
+    return cache_stats()
 
 @audio_router.websocket("/ws/audio")
-async def audio_stream(websocket: WebSocket):
+async def audio_stream(
+    websocket: WebSocket,
+    mode: str = Query("batch"),
+    meeting_id: Optional[int] = Query(None)
+):
     """
     WebSocket을 통해 실시간 오디오 데이터를 수신하고 MinIO에 저장 후 Celery 작업 큐에 추가
+    meeting_id가 주어지면 전사 결과를 해당 회의의 대화 기록으로 저장
+    mode=live 인 경우 녹음 중 세그먼트 단위로 전사하여 부분 결과를 같은 소켓으로 전송하고,
+    녹음이 끝나면 그 결과를 회의에 저장 (실패한 세그먼트가 있으면 대신 batch 전사 작업을 제출)
+    (클라이언트는 빈 프레임을 보내 녹음 종료를 알리고 최종 결과를 기다림)
     """
     await websocket.accept()
-    print("✅ WebSocket connection established.")
+    logger.info("✅ WebSocket connection established.")
+    started_at = time.monotonic()
+    WEBSOCKET_SESSIONS.inc()
+    WEBSOCKET_SESSIONS_TOTAL.inc()
 
     file_id = str(uuid.uuid4())
     webm_file_path = os.path.join(SAVE_PATH, f"{file_id}.webm")
 
-    frames = []
+    # 프레임을 메모리에 모으지 않고 도착하는 대로 스풀 파일/MinIO로 기록
+    writer = open_ingest_writer(file_id)
+    writer_finished = False  # close/abort까지 마쳤는지 (아니면 finally에서 abort)
     total_bytes_received = 0
+    frames_received = 0
+    frame_log = LogSampler(FRAME_LOG_INTERVAL)
 
+    live = mode == "live"
+    segmenter = None
+    sender = None
     try:
+        if live:
+            pending = asyncio.Queue()
+
+            async def dispatch_segment(index, offset, pcm):
+                object_name = f"{file_id}_segments/{index:05d}.wav"
+                wav_data = pcm_to_wav(pcm)
+                await asyncio.to_thread(
+                    get_minio_client().put_object, MINIO_BUCKET_NAME, object_name,
+                    io.BytesIO(wav_data), len(wav_data)
+                )
+                result = transcribe_segment_task.apply_async((object_name,), priority=MAX_PRIORITY)
+                pending.put_nowait((index, offset, result))
+
+            async def report_failed_segment(index, offset, error):
+                # 순서대로 결과를 보내는 sender가 이 세그먼트에서 멈추지 않도록 실패로 표시해 넘김
+                pending.put_nowait((index, offset, None))
+
+            segmenter = LiveSegmenter(dispatch_segment, LIVE_SEGMENT_SECONDS, report_failed_segment)
+            await segmenter.start()
+            sender = asyncio.create_task(send_partial_transcripts(websocket, pending))
+
         while True:
             try:
                 data = await websocket.receive_bytes()
                 if not data:
-                    print("⚠️ Received empty audio data. Stopping recording.")
+                    logger.info("⚠️ Received empty audio data. Stopping recording.", extra={"file_id": file_id})
                     break
                 
-                frames.append(data)
+                await writer.write(data)
+                if segmenter:
+                    await segmenter.feed(data)
                 total_bytes_received += len(data)
-                print(f"📡 Received {len(data)} bytes (Total: {total_bytes_received} bytes).")
+                AUDIO_BYTES_INGESTED.inc(len(data))
+                frames_received += 1
+                # 프레임마다 로그를 남기지 않고 일정 간격으로 요약만 기록
+                skipped = frame_log.sample()
+                if skipped is not None:
+                    logger.debug(
+                        f"📡 Received {len(data)} bytes (Total: {total_bytes_received} bytes).",
+                        extra={"file_id": file_id, "frames": frames_received, "frames_since_last_log": skipped + 1}
+                    )
 
             except Exception as e:
-                print(f"❌ Connection closed unexpectedly: {e}")
+                logger.info(f"❌ Connection closed unexpectedly: {e}", extra={"file_id": file_id})
                 break  # WebSocket 종료 시 루프 탈출
 
+        if segmenter:
+            # 남은 오디오를 마지막 세그먼트로 보내고 모든 부분 결과 전송 완료까지 대기
+            await segmenter.finish()
+            pending.put_nowait(None)
+            transcripts, failed_segments = await sender
+
         if total_bytes_received == 0:
-            print("❌ No valid audio data received. File will not be saved.")
+            logger.warning("❌ No valid audio data received. File will not be saved.", extra={"file_id": file_id})
+            writer_finished = True
+            await writer.abort()
+            return
+
+        await writer.close()
+        writer_finished = True
+
+        if AUDIO_INGEST_MODE != "minio":
+            logger.info(
+                f"✅ WebM file saved: {webm_file_path}",
+                extra={"file_id": file_id, "bytes": total_bytes_received, "frames": frames_received}
+            )
+            await upload_spool_file(file_id, webm_file_path)
+        else:
+            logger.info(
+                f"✅ WebM file streamed to MinIO: {file_id}.webm",
+                extra={"file_id": file_id, "bytes": total_bytes_received, "frames": frames_received}
+            )
+
+        if live:
+            final = {"type": "final", "text": " ".join(text for _, text in transcripts if text).strip()}
+            if failed_segments:
+                # 빠진 구간이 있는 결과는 저장하지 않고 녹음 전체를 batch 전사로 다시 처리 (저장/보관 포함)
+                task = submit_recording(file_id, meeting_id, time.monotonic() - started_at)
+                final["failed_segments"] = failed_segments
+                final["task_id"] = task.id
+            else:
+                await finish_live_recording(file_id, meeting_id, transcripts)
+            if websocket.client_state == WebSocketState.CONNECTED:
+                await websocket.send_json(final)
+            return
+
+        # Celery Task 실행 (실시간으로 수신했으므로 연결 시간 ≈ 녹음 길이로 큐/우선순위 결정)
+        task = submit_recording(file_id, meeting_id, time.monotonic() - started_at)
+        await websocket.send_text(f"Task submitted: {task.id}")
+
+    finally:
+        if segmenter:
+            # 중간에 오류로 빠져나온 경우 ffmpeg와 부분 결과 전송 작업이 남지 않게 정리
+            await segmenter.close()
+        if sender and not sender.done():
+            sender.cancel()
+        if not writer_finished:
+            # close() 전에 예외/취소로 빠져나옴: 업로드 스레드·멀티파트 업로드나 스풀 파일이 남지 않게 중단
+            try:
+                await writer.abort()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to abort ingest writer: {e}", extra={"file_id": file_id})
+        WEBSOCKET_SESSIONS.dec()
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close()
+            logger.info("🔌 WebSocket connection closed successfully.")
+
+# 재개 가능한 세션의 연결 관리 (같은 세션은 한 연결만 기록)
+session_registry = SessionRegistry()
+_session_sweep_lock = asyncio.Lock()
+_session_sweeper = None
+# 같은 세션의 이전 연결이 정리될 때까지 기다리는 최대 시간 (초)
+SESSION_TAKEOVER_TIMEOUT = 10
+
+async def finalize_expired_sessions():
+    """
+    TTL 동안 재연결되지 않은 세션을 받은 데까지 업로드하고 전사 작업 제출
+    """
+    if _session_sweep_lock.locked():
+        return
+    async with _session_sweep_lock:
+        for session_id in expired_sessions(session_registry.active()):
+            if session_registry.is_active(session_id):
+                continue
+            try:
+                meta = load_meta(session_id)
+                path = session_path(session_id)
+                if os.path.exists(path) and os.path.getsize(path) > 0:
+                    recording_seconds = last_activity(session_id) - meta["created_at"]
+                    await upload_spool_file(session_id, path)
+                    submit_recording(session_id, meta.get("meeting_id"), recording_seconds)
+                logger.info("⌛ Expired recording session finalized.", extra={"session_id": session_id})
+            except Exception as e:
+                logger.error(f"❌ Failed to finalize expired session: {e}", extra={"session_id": session_id})
+            finally:
+                remove_session_files(session_id)
+
+async def sweep_expired_sessions(interval=AUDIO_SESSION_SWEEP_INTERVAL):
+    """
+    interval 초마다 만료된 세션을 정리하는 백그라운드 루프 (새 연결이 없어도 방치된 세션을 전사)
+    """
+    while True:
+        try:
+            await finalize_expired_sessions()
+        except Exception as e:
+            logger.error(f"❌ Expired session sweep failed: {e}")
+        await asyncio.sleep(interval)
+
+def start_session_sweeper():
+    """
+    앱 기동 시 세션 정리 루프 시작 (태스크 참조를 보관해 가비지 컬렉션으로 사라지지 않게 함)
+    """
+    global _session_sweeper
+    if _session_sweeper is None or _session_sweeper.done():
+        _session_sweeper = asyncio.create_task(sweep_expired_sessions())
+
+async def stop_session_sweeper():
+    """
+    앱 종료 시 세션 정리 루프 취소
+    """
+    global _session_sweeper
+    if _session_sweeper is not None:
+        _session_sweeper.cancel()
+        try:
+            await _session_sweeper
+        except asyncio.CancelledError:
+            pass
+        _session_sweeper = None
+
+@audio_router.websocket("/ws/audio/session")
+async def audio_session_stream(
+    websocket: WebSocket,
+    session_id: Optional[str] = Query(None),
+    meeting_id: Optional[int] = Query(None)
+):
+    """
+    연결이 끊겨도 이어서 녹음할 수 있는 세션 방식의 오디오 수신 (batch 전사)
+
+    - 연결 직후 서버가 {"type": "session", "session_id", "acked_bytes"} 를 보냄
+      (session_id 없이 연결하면 새 세션, 있으면 acked_bytes 위치부터 이어서 보내면 됨)
+    - 바이너리 프레임 = 헤더(순번 uint32, 바이트 오프셋 uint64, 빅엔디언) + 오디오 바이트
+    - 디스크에 fsync 된 뒤 {"type": "ack", "seq", "acked_bytes"} 를 보내며,
+      클라이언트는 acked_bytes 이전의 바이트를 버려도 된다.
+    - 중간이 빠진 프레임이 오면 {"type": "resume", "acked_bytes"} 로 다시 보낼 위치를 알림
+    - 빈 프레임을 보내면 녹음을 끝내고 전사 작업을 제출
+    """
+    await websocket.accept()
+
+    if session_id is None:
+        session_id = RecordingSession.create(meeting_id, AUDIO_INGEST_BUFFER_SIZE).session_id
+    elif not session_exists(session_id):
+        await websocket.send_json({"type": "error", "error": "Unknown or expired session"})
+        await websocket.close(code=4404)
+        return
+
+    # 끊긴 줄 모르고 남아 있는 이전 연결을 닫고, 그 연결이 스풀 파일을 정리할 때까지 대기
+    try:
+        acquired = await session_registry.acquire(session_id, websocket, SESSION_TAKEOVER_TIMEOUT)
+    except asyncio.TimeoutError:
+        await websocket.send_json({"type": "error", "error": "Session is busy"})
+        await websocket.close(code=4409)
+        return
+    if not acquired:
+        # 기다리는 동안 같은 세션으로 더 새로운 연결이 들어옴
+        await websocket.close(code=4000, reason="Session resumed on another connection")
+        return
+
+    WEBSOCKET_SESSIONS.inc()
+    WEBSOCKET_SESSIONS_TOTAL.inc()
+    session = None
+    try:
+        session = RecordingSession.load(session_id, AUDIO_INGEST_BUFFER_SIZE)
+        if session is None:
+            await websocket.send_json({"type": "error", "error": "Unknown or expired session"})
+            await websocket.close(code=4404)
             return
+        logger.info(
+            "✅ Recording session connected.",
+            extra={"session_id": session_id, "acked_bytes": session.acked_bytes}
+        )
+        await websocket.send_json(
+            {"type": "session", "session_id": session_id, "acked_bytes": session.acked_bytes}
+        )
+
+        finished = False
+        while True:
+            try:
+                data = await websocket.receive_bytes()
+            except Exception as e:
+                logger.info(f"🔌 Session connection dropped: {e}", extra={"session_id": session_id})
+                break
+            if not data:
+                finished = True
+                break
+            if len(data) < CHUNK_HEADER.size:
+                await websocket.send_json({"type": "error", "error": "Chunk header missing"})
+                continue
+
+            seq, offset = CHUNK_HEADER.unpack_from(data)
+            received = session.received_bytes
+            if not await session.append(offset, data[CHUNK_HEADER.size:]):
+                # 앞 청크가 빠졌으므로 받은 데까지 확정하고 그 위치부터 다시 요청
+                await websocket.send_json({"type": "resume", "acked_bytes": await session.sync()})
+                continue
+            # 재전송으로 중복된 바이트는 수신량에 포함하지 않음
+            AUDIO_BYTES_INGESTED.inc(session.received_bytes - received)
+            session.last_seq = seq
 
-        # WebM 파일 저장
-        with open(webm_file_path, "wb") as webm_file:
-            webm_file.write(b''.join(frames))
-        print(f"✅ WebM file saved: {webm_file_path}")
+            if session.should_sync():
+                acked_bytes = await session.sync()
+                await websocket.send_json({"type": "ack", "seq": seq, "acked_bytes": acked_bytes})
 
-        # MinIO에 WebM 파일 업로드
-        minio_client.fput_object(MINIO_BUCKET_NAME, f"{file_id}.webm", webm_file_path)
+        await session.close()
+        if not finished:
+            # 재연결을 기다리며 세션 유지 (AUDIO_SESSION_TTL 이후 정리)
+            return
+
+        if session.received_bytes == 0:
+            logger.warning("❌ No valid audio data received. Session discarded.", extra={"session_id": session_id})
+            session.remove()
+            return
 
-        # Celery Task 실행
-        task = process_audio_task.delay(file_id)
+        await websocket.send_json(
+            {"type": "ack", "seq": session.last_seq, "acked_bytes": session.acked_bytes}
+        )
+        logger.info(
+            f"✅ Recording session finished: {session.received_bytes} bytes",
+            extra={"session_id": session_id, "bytes": session.received_bytes}
+        )
+        # 세션 id를 파일 id로 사용해 업로드하고 세션 파일 정리
+        await upload_spool_file(session_id, session.path)
+        session.remove()
+        task = submit_recording(session_id, session.meeting_id, session.recording_seconds)
         await websocket.send_text(f"Task submitted: {task.id}")
-        print(f"📤 Task {task.id} submitted to Celery.")
 
     finally:
+        if session is not None:
+            # 전송 중 오류로 빠져나온 경우에도 받은 바이트는 디스크에 남김
+            await session.close()
+        session_registry.release(session_id, websocket)
+        WEBSOCKET_SESSIONS.dec()
         if websocket.client_state == WebSocketState.CONNECTED:
             await websocket.close()
-            print("🔌 WebSocket connection closed successfully.")
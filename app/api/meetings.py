@@ -1,19 +1,56 @@
+import json
+import asyncio
 import logging
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse, RedirectResponse
+from minio.error import S3Error
+from sqlalchemy import select, literal
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime, timedelta
-from app.utils.database import get_db
-from app.utils.models import Meeting, Topic, TopicDetail, Keyword, KeyTopic, Conversation
+from datetime import date, datetime, timedelta
+from app.utils.database import get_db, AsyncSessionLocal
+from app.utils.models import Meeting, Topic, TopicDetail, Keyword, KeyTopic, Conversation, bump_meeting_version
 from app.utils.verification import get_current_user  # 인증 모듈 추가
+from app.utils.conversations import bulk_insert_conversations_async
+from app.utils.storage import get_minio_client, iter_object, MINIO_BUCKET_NAME
+from app.utils.archive import load_seek_index, ARCHIVE_CONTENT_TYPE
 
-import logging
+router = APIRouter()
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+# 한 페이지 최대 행 수, 전체 내보내기 시 한 번에 읽는 행 수, 검색 결과 한 페이지 기본 행 수
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+SEARCH_PAGE_SIZE = 20
+# 오디오 스트리밍 시 MinIO에서 한 번에 읽는 크기
+AUDIO_CHUNK_SIZE = 64 * 1024
 
-router = APIRouter()
+def parse_date(year, month, day=1):
+    """
+    경로로 받은 년/월/일을 datetime으로 변환 (없는 날짜면 422)
+    """
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid date")
+
+async def fetch_page(db, stmt, model, response, limit, after_id):
+    """
+    id 기준 keyset 페이지네이션: after_id보다 큰 id의 행을 id 순으로 최대 limit개 조회
+    페이지가 가득 찼으면 다음 페이지 커서를 X-Next-After-Id 헤더로 전달 (limit이 없으면 전체 조회)
+    """
+    stmt = stmt.order_by(model.id)
+    if after_id is not None:
+        stmt = stmt.where(model.id > after_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    rows = result.scalars().all()
+    if limit is not None and len(rows) == limit:
+        response.headers["X-Next-After-Id"] = str(rows[-1].id)
+    return rows
 
 # Pydantic 모델 정의
 class MeetingCreate(BaseModel):
@@ -71,23 +108,62 @@ class ConversationResponse(ConversationCreate):
     class Config:
         orm_mode = True
 
+class CalendarDayResponse(BaseModel):
+    date: date
+    count: int
+    meeting_ids: List[int]
+
+class TopicDetailResponse(BaseModel):
+    id: int
+    topic_id: int
+    detail: Optional[str] = None
+    class Config:
+        orm_mode = True
+
+class TopicFullResponse(TopicResponse):
+    details: List[TopicDetailResponse] = []
+
+class MeetingFullResponse(MeetingResponse):
+    topics: List[TopicFullResponse] = []
+    keywords: List[KeywordResponse] = []
+    key_topics: List[KeyTopicResponse] = []
+    conversations: List[ConversationResponse] = []
+
+class ConversationBatchItem(BaseModel):
+    speaker: str
+    time_stamp: str
+    content: str
+    color: Optional[str] = None
+
+class ConversationBatchResponse(BaseModel):
+    meeting_id: int
+    inserted: int
+
+class SearchHitResponse(BaseModel):
+    conversation_id: int
+    meeting_id: int
+    meeting_name: str
+    meeting_date: datetime
+    speaker: str
+    time_stamp: str
+    content: str
+    score: float
+
 # 🔒 회의 생성 API (인증 추가)
 @router.post("/", response_model=MeetingResponse)
-def create_meeting(
+async def create_meeting(
     meeting: MeetingCreate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_db), 
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
     new_meeting = Meeting(**meeting.dict())
     db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
+    await db.flush()
 
     # 기본 주제 추가
     default_topic = Topic(meeting_id=new_meeting.id, title="기본 주제")
     db.add(default_topic)
-    db.commit()
-    db.refresh(default_topic)
+    await db.flush()
 
     # 기본 주제의 세부 내용 추가
     default_topic_detail = TopicDetail(topic_id=default_topic.id, detail="기본 주제에 대한 세부 내용")
@@ -97,64 +173,333 @@ def create_meeting(
     default_keyword = Keyword(meeting_id=new_meeting.id, keyword="기본 키워드", summary="이 키워드는 자동 생성됨")
     db.add(default_keyword)
 
-    # 커밋
-    db.commit()
+    # 커밋 (회의/주제/키워드를 한 트랜잭션으로 저장)
+    await db.commit()
 
     return new_meeting
 
 # 🔒 모든 회의 조회 API (인증 추가)
 @router.get("/", response_model=List[MeetingResponse])
-def get_meetings(
-    db: Session = Depends(get_db), 
+async def get_meetings(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db), 
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수
+):
+    return await fetch_page(db, select(Meeting), Meeting, response, limit, after_id)
+
+# 🔒 기간별 일자별 회의 요약 API (인증 추가)
+@router.get("/calendar", response_model=List[CalendarDayResponse])
+async def get_meeting_calendar(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수
+):
+    """
+    from~to(포함) 기간의 일자별 회의 수와 id 목록을 GROUP BY 쿼리 한 번으로 반환
+    meeting_date 조건은 컬럼에 함수를 씌우지 않은 범위 조건이므로
+    ix_meetings_meeting_date 인덱스 범위 스캔으로 처리된다.
+    """
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must not be earlier than 'from'")
+
+    # GROUP_CONCAT은 group_concat_max_len(기본 1024바이트)에서 잘리므로 (일자, id) 행을 받아 일자별로 묶음
+    result = await db.execute(
+        select(Meeting.meeting_date, Meeting.id)
+        .where(
+            Meeting.meeting_date >= datetime.combine(from_date, datetime.min.time()),
+            Meeting.meeting_date < datetime.combine(to_date + timedelta(days=1), datetime.min.time()),
+        )
+        .order_by(Meeting.meeting_date, Meeting.id)
+    )
+    days = {}
+    for meeting_date, meeting_id in result.all():
+        days.setdefault(meeting_date.date(), []).append(meeting_id)
+    return [
+        {"date": meeting_day, "count": len(ids), "meeting_ids": sorted(ids)}
+        for meeting_day, ids in days.items()
+    ]
+
+# 🔍 전체 회의록 검색 API (/{meeting_id}보다 먼저 선언해야 함)
+@router.get("/search", response_model=List[SearchHitResponse])
+async def search_conversations(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
-    return db.query(Meeting).all()
+    """
+    대화 내용에서 q를 검색해 관련도 순으로 반환
+    MySQL에서는 conversations.content의 FULLTEXT(ngram) 인덱스로 MATCH ... AGAINST 검색을 하므로
+    테이블 전체를 읽지 않는다. 그 외 DB(로컬 SQLite 등)에서는 LIKE 검색으로 대체하고 최신 순으로 정렬한다.
+    다음 페이지가 있으면 X-Next-Offset 헤더로 offset을 전달
+    """
+    if db.bind.dialect.name == "mysql":
+        score = match(Conversation.content, against=q).in_natural_language_mode()
+        condition = score
+        order = (score.desc(), Conversation.id.desc())
+    else:
+        score = literal(1.0)
+        condition = Conversation.content.contains(q, autoescape=True)
+        order = (Conversation.id.desc(),)
+
+    stmt = (
+        select(
+            Conversation.id.label("conversation_id"),
+            Conversation.meeting_id,
+            Meeting.meeting_name,
+            Meeting.meeting_date,
+            Conversation.speaker,
+            Conversation.time_stamp,
+            Conversation.content,
+            score.label("score"),
+        )
+        .join(Meeting, Meeting.id == Conversation.meeting_id)
+        .where(condition)
+        .order_by(*order)
+        .offset(offset)
+        .limit(limit + 1)  # 다음 페이지 존재 여부 확인용 1행 추가
+    )
+    rows = (await db.execute(stmt)).mappings().all()
+    if len(rows) > limit:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return rows[:limit]
 
 # 🔒 특정 회의 조회 API (인증 추가)
 @router.get("/{meeting_id}", response_model=MeetingResponse)
-def get_meeting(
+async def get_meeting(
     meeting_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_db), 
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+    meeting = result.scalars().first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
 
+def meeting_etag(meeting_id, version):
+    return f'"meeting-{meeting_id}-v{version}"'
+
+# 🔒 회의 페이지 전체 데이터 조회 API (인증 추가)
+@router.get("/{meeting_id}/full", response_model=MeetingFullResponse)
+async def get_meeting_full(
+    meeting_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수
+):
+    """
+    회의와 주제/세부 내용/키워드/핵심 주제/대화 기록을 고정된 수(6)의 쿼리로 한 번에 반환
+    회의 데이터를 바꾸는 쓰기마다 증가하는 meetings.version으로 ETag를 만들며,
+    If-None-Match가 있으면 버전만 조회해 일치할 때 나머지 쿼리 없이 304 응답
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = (await db.execute(select(Meeting.version).where(Meeting.id == meeting_id))).scalar()
+        if version is None:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        etag = meeting_etag(meeting_id, version)
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag})
+
+    result = await db.execute(
+        select(Meeting)
+        .where(Meeting.id == meeting_id)
+        .options(
+            selectinload(Meeting.topics).selectinload(Topic.details),
+            selectinload(Meeting.keywords),
+            selectinload(Meeting.key_topics),
+            selectinload(Meeting.conversations),
+        )
+    )
+    meeting = result.scalars().first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    response.headers["ETag"] = meeting_etag(meeting_id, meeting.version)
+    return meeting
+
 # 🔒 특정 회의의 주제 조회 API (인증 추가)
 @router.get("/{meeting_id}/topics", response_model=List[TopicResponse])
-def get_topics(
+async def get_topics(
     meeting_id: int, 
-    db: Session = Depends(get_db), 
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db), 
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
-    return db.query(Topic).filter(Topic.meeting_id == meeting_id).all()
+    stmt = select(Topic).where(Topic.meeting_id == meeting_id)
+    return await fetch_page(db, stmt, Topic, response, limit, after_id)
 
 # 🔒 특정 회의의 핵심 주제 조회 API (인증 추가)
 @router.get("/{meeting_id}/key_topics", response_model=List[KeyTopicResponse])
-def get_key_topics(
+async def get_key_topics(
     meeting_id: int, 
-    db: Session = Depends(get_db), 
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db), 
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
-    return db.query(KeyTopic).filter(KeyTopic.meeting_id == meeting_id).all()
+    stmt = select(KeyTopic).where(KeyTopic.meeting_id == meeting_id)
+    return await fetch_page(db, stmt, KeyTopic, response, limit, after_id)
 
 # 🔒 특정 회의의 대화 내용 조회 API (인증 추가)
 @router.get("/{meeting_id}/conversations", response_model=List[ConversationResponse])
-def get_conversations(
+async def get_conversations(
     meeting_id: int, 
-    db: Session = Depends(get_db), 
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db), 
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
-    return db.query(Conversation).filter(Conversation.meeting_id == meeting_id).all()
+    stmt = select(Conversation).where(Conversation.meeting_id == meeting_id)
+    return await fetch_page(db, stmt, Conversation, response, limit, after_id)
+
+def parse_byte_range(header, size):
+    """
+    Range 헤더(bytes=start-end, bytes=start-, bytes=-suffix)를 (start, end) 포함 구간으로 변환
+    여러 구간 요청 등 처리하지 않는 형식이면 None (전체 응답), 범위를 벗어나면 416
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416, detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+async def get_audio_object_name(db, meeting_id):
+    result = await db.execute(select(Meeting.audio_url).where(Meeting.id == meeting_id))
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    if not row.audio_url:
+        raise HTTPException(status_code=404, detail="Audio not available")
+    return row.audio_url
+
+# 🔒 회의 녹음 재생 API (HTTP Range 지원, 인증 추가)
+@router.get("/{meeting_id}/audio")
+async def get_meeting_audio(
+    meeting_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수
+):
+    """
+    회의 녹음(보관용 Opus)을 MinIO에서 바로 스트리밍
+    Range 요청이면 MinIO에도 해당 바이트 구간만 요청해 206으로 응답하므로
+    대화의 time_stamp 위치로 이동할 때 전체 녹음을 받지 않는다. (시간 → 바이트 위치는 /audio/index)
+    audio_url이 외부 URL이면 그 주소로 리다이렉트
+    """
+    object_name = await get_audio_object_name(db, meeting_id)
+    if object_name.startswith(("http://", "https://")):
+        return RedirectResponse(object_name, status_code=307)
+
+    try:
+        stat = await asyncio.to_thread(get_minio_client().stat_object, MINIO_BUCKET_NAME, object_name)
+    except S3Error:
+        raise HTTPException(status_code=404, detail="Audio not available")
+
+    size = stat.size
+    etag = f'"{stat.etag}"'
+    headers = {"Accept-Ranges": "bytes", "ETag": etag, "Cache-Control": "private, max-age=3600"}
+    byte_range = None
+    range_header = request.headers.get("range")
+    # If-Range가 현재 버전과 다르면 (객체가 바뀐 경우) 구간 대신 전체를 보냄
+    if range_header and request.headers.get("if-range", etag) == etag:
+        byte_range = parse_byte_range(range_header, size)
+
+    if byte_range is None:
+        start, length, status_code = 0, size, 200
+    else:
+        start, end = byte_range
+        length, status_code = end - start + 1, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+
+    return StreamingResponse(
+        iter_object(object_name, start, length, AUDIO_CHUNK_SIZE) if length else iter(()),
+        status_code=status_code,
+        media_type=stat.content_type or ARCHIVE_CONTENT_TYPE,
+        headers=headers,
+    )
+
+# 🔒 회의 녹음 시간 색인 조회 API (인증 추가)
+@router.get("/{meeting_id}/audio/index")
+async def get_meeting_audio_index(
+    meeting_id: int,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수
+):
+    """
+    보관용 Opus의 시간(초) → 바이트 오프셋 색인
+    points의 [t, offset] 중 t가 time_stamp 이하인 마지막 지점을 골라
+    0 ~ header_bytes-1 구간(코덱 헤더)과 offset 이후 구간을 Range로 받아 이어 붙이면 그 위치부터 재생된다.
+    """
+    object_name = await get_audio_object_name(db, meeting_id)
+    try:
+        return await asyncio.to_thread(load_seek_index, object_name)
+    except S3Error:
+        raise HTTPException(status_code=404, detail="Audio index not available")
+
+async def stream_conversations(meeting_id):
+    """
+    회의의 대화 기록을 EXPORT_BATCH_SIZE개씩 keyset으로 읽어 NDJSON으로 내보냄
+    (메모리에는 한 배치만 유지, 응답 스트림 동안 사용할 세션을 직접 엶)
+    """
+    columns = [
+        Conversation.id, Conversation.meeting_id, Conversation.speaker,
+        Conversation.time_stamp, Conversation.content, Conversation.color,
+    ]
+    after_id = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(*columns)
+                .where(Conversation.meeting_id == meeting_id, Conversation.id > after_id)
+                .order_by(Conversation.id)
+                .limit(EXPORT_BATCH_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            yield "".join(json.dumps(row._asdict(), ensure_ascii=False) + "\n" for row in rows)
+            after_id = rows[-1].id
+
+# 🔒 특정 회의의 전체 대화 내용 내보내기 API (NDJSON 스트리밍, 인증 추가)
+@router.get("/{meeting_id}/conversations/export")
+async def export_conversations(
+    meeting_id: int,
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수
+):
+    return StreamingResponse(stream_conversations(meeting_id), media_type="application/x-ndjson")
 
 # 🔒 특정 회의의 대화 기록 추가 API (인증 추가)
 @router.post("/{meeting_id}/conversations", response_model=ConversationResponse)
-def add_conversation(
+async def add_conversation(
     meeting_id: int, 
     conversation: ConversationCreate, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
     new_conversation = Conversation(
@@ -165,23 +510,45 @@ def add_conversation(
         color=conversation.color
     )
     db.add(new_conversation)
-    db.commit()
-    db.refresh(new_conversation)
+    await db.execute(bump_meeting_version(meeting_id))
+    await db.commit()
+    await db.refresh(new_conversation)
     return new_conversation
 
+# 🔒 특정 회의의 대화 기록 일괄 추가 API (인증 추가)
+@router.post("/{meeting_id}/conversations/batch", response_model=ConversationBatchResponse)
+async def add_conversations_batch(
+    meeting_id: int,
+    conversations: List[ConversationBatchItem],
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)  # 🔒 인증 필수
+):
+    rows = [{"meeting_id": meeting_id, **conversation.dict()} for conversation in conversations]
+    try:
+        inserted = await bulk_insert_conversations_async(db, rows)
+        await db.execute(bump_meeting_version(meeting_id))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Conversation batch insert failed")
+    return {"meeting_id": meeting_id, "inserted": inserted}
+
 # 🔒 특정 년/월의 meeting_id 조회 API (인증 추가)
 @router.get("/by-date/{year}/{month}", response_model=List[MeetingIDResponse])
-def get_meetings_by_month(
+async def get_meetings_by_month(
     year: int, 
     month: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_db), 
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
-    logging.debug(f"year:{year} month:{month} user_id:{user_id}")
-    meetings = db.query(Meeting.id).filter(
-        Meeting.meeting_date >= datetime(year, month, 1),
-        Meeting.meeting_date < datetime(year, month + 1, 1) if month < 12 else datetime(year + 1, 1, 1)
-    ).all()
+    logging.debug("get_meetings_by_month", extra={"year": year, "month": month, "user_id": user_id})
+    start = parse_date(year, month)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    result = await db.execute(select(Meeting.id).where(
+        Meeting.meeting_date >= start,
+        Meeting.meeting_date < end
+    ))
+    meetings = result.all()
     
     if not meetings:
         raise HTTPException(status_code=404, detail="No meetings found for this month")
@@ -190,17 +557,19 @@ def get_meetings_by_month(
 
 # 🔒 특정 년/월/일의 meeting_id 조회 API (인증 추가)
 @router.get("/by-date/{year}/{month}/{day}", response_model=List[MeetingIDResponse])
-def get_meetings_by_day(
+async def get_meetings_by_day(
     year: int, 
     month: int, 
     day: int, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user)  # 🔒 인증 필수
 ):
-    meetings = db.query(Meeting.id).filter(
-        Meeting.meeting_date >= datetime(year, month, day),
-        Meeting.meeting_date < datetime(year, month, day + 1)
-    ).all()
+    start = parse_date(year, month, day)
+    result = await db.execute(select(Meeting.id).where(
+        Meeting.meeting_date >= start,
+        Meeting.meeting_date < start + timedelta(days=1)
+    ))
+    meetings = result.all()
     
     if not meetings:
         raise HTTPException(status_code=404, detail="No meetings found for this date")
@@ -1,61 +1,65 @@
 # /app/api/users.py
 import logging
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Form, Body
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.utils.database import get_db
-from app.utils.auth import oauth2_scheme, get_password_hash, verify_password, ACCESS_TOKEN_EXPIRE_MINUTES
-from app.utils.verification import create_access_token, decode_access_token
+from app.utils.auth import (
+    get_password_hash_async, verify_password_async, password_pool, ACCESS_TOKEN_EXPIRE_MINUTES
+)
+from app.utils.verification import (
+    create_access_token, get_current_user as get_current_userid,
+    get_cached_user, cache_user, auth_cache_stats, CachedUser
+)
 from app.utils.models import User
 
 router = APIRouter()
 
 # 현재 사용자 확인 (인증용)
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    payload = decode_access_token(token)
-    # payload에 'sub' 키에 userid가 들어있다고 가정
-    userid = payload.get("sub")
-    if userid is None:
-        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-    
-    user = db.query(User).filter(User.userid == userid).first()
+# 토큰 검증은 verification.get_current_user의 캐시를 공유하고, 사용자 행도 짧게 캐시
+async def get_current_user(userid: str = Depends(get_current_userid), db: AsyncSession = Depends(get_db)):
+    user = get_cached_user(userid)
+    if user is not None:
+        return user
+
+    result = await db.execute(select(User).where(User.userid == userid))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    
-    return user
+
+    return cache_user(userid, user)
 
 # 모든 사용자 조회 (예시, 인증 필요)
 @router.get("/")
-async def get_users(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    users = db.query(User.id, User.username, User.userid).all()
+async def get_users(current_user: CachedUser = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User.id, User.username, User.userid))
+    users = result.all()
     return [{"id": user.id, "username": user.username, "userid": user.userid} for user in users]
-router = APIRouter()
-
-from fastapi import Body
 
 @router.post("/")
 async def create_user(
     username: str = Body(...),
     userid: str = Body(...),
     password: str = Body(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # 중복 체크 및 사용자 생성 코드 동일
-    existing_user = db.query(User).filter(or_(User.username == username, User.userid == userid)).first()
+    result = await db.execute(select(User).where(or_(User.username == username, User.userid == userid)))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Username or Userid already exists")
     
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash_async(password)
     new_user = User(username=username, userid=userid, hashed_password=hashed_password)
     db.add(new_user)
     try:
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="User creation failed")
     return {"msg": "User created successfully", "username": new_user.username, "userid": new_user.userid}
 
@@ -64,22 +68,33 @@ async def create_user(
 async def login(
     userid: str = Form(...), 
     password: str = Form(...), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # 요청 데이터를 확인하기 위한 로그 출력 (비밀번호 전체는 출력하지 않음)
     logging.info(f"Received login request: userid={userid}, password_length={len(password)}")
     
     try:
-        user = db.query(User).filter(User.userid == userid).first()
-        if not user or not verify_password(password, user.hashed_password):
+        result = await db.execute(select(User).where(User.userid == userid))
+        user = result.scalars().first()
+        if not user or not await verify_password_async(password, user.hashed_password):
             raise HTTPException(status_code=400, detail="Incorrect userid or password")
         access_token = create_access_token(
             {"user_id": user.userid},
             expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         )
         return {"access_token": access_token, "token_type": "bearer"}
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Login error: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+# 인증 캐시 적중률 조회
+@router.get("/auth_cache")
+def get_auth_cache_stats(current_user: CachedUser = Depends(get_current_user)):  # 🔒 인증 필수
+    return auth_cache_stats()
 
+# 비밀번호 해시 풀 사용률/지연 시간 조회
+@router.get("/password_pool")
+def get_password_pool_stats(current_user: CachedUser = Depends(get_current_user)):  # 🔒 인증 필수
+    return password_pool.stats()
@@ -1,10 +1,12 @@
 # main.py
-from fastapi import FastAPI, Depends, HTTPException, Form, status, Query, WebSocket
+import time
+from fastapi import FastAPI, Depends, HTTPException, Form, status, Query, WebSocket, Response
 from fastapi.middleware.cors import CORSMiddleware
-import logging
+from app.utils.logging_config import setup_logging
+from app.utils.metrics import render_metrics, observe_http_request, route_template
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+# 로그 설정 (LOG_LEVEL / LOG_FORMAT 환경 변수로 제어)
+setup_logging()
 
 app = FastAPI()
 
@@ -19,21 +21,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-After-Id", "X-Next-Offset", "ETag", "Content-Range", "Accept-Ranges"],
 )
 
 
 @app.middleware("http")
-async def add_cors_headers(request, call_next):
-    logging.debug(f"Request origin: {request.headers.get('origin')}")
-    response = await call_next(request)
-    origin = request.headers.get('origin')
-    if origin in origins:
-        response.headers["Access-Control-Allow-Origin"] = origin
-    response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-    logging.debug(f"Response headers: {response.headers}")
-    return response
+async def record_request_metrics(request, call_next):
+    # 라우트 템플릿(/meetings/{meeting_id}) 기준으로 지연 시간 기록
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        observe_http_request(
+            request.method, route_template(request.scope), status_code, time.perf_counter() - start
+        )
+
+
+@app.on_event("startup")
+async def start_job_event_consumer():
+    # 작업 진행 이벤트 수신을 기동 시점에 시작 (첫 SSE 요청 전에 발행된 이벤트도 기록에 남도록)
+    from app.utils.job_events import get_job_event_hub
+    get_job_event_hub()
+
+
+@app.on_event("startup")
+async def start_background_sweeps():
+    # TTL 동안 재연결되지 않은 녹음 세션을 주기적으로 전사 (AUDIO_SESSION_SWEEP_INTERVAL)
+    from app.api.audio_recording import start_session_sweeper
+    start_session_sweeper()
+
+
+@app.on_event("shutdown")
+async def stop_background_sweeps():
+    from app.api.audio_recording import stop_session_sweeper
+    await stop_session_sweeper()
+
+
+# Prometheus 지표
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 # 기능별 모듈(예, 사용자 관련 라우터) 등록
 from app.api.users import router as users_router
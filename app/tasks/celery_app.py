@@ -0,0 +1,94 @@
+from celery import Celery
+from celery.signals import before_task_publish
+from kombu import Queue
+import os
+import time
+from dotenv import load_dotenv
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
+CELERY_BACKEND_URL = os.getenv("CELERY_BACKEND_URL")
+
+# 큐 구성
+# live: 실시간 세그먼트 전사, 짧은 녹음 (지연 시간 우선)
+# bulk: 긴 녹음 전사, 키워드 추출/백필 등 오래 걸리는 작업
+LIVE_QUEUE = os.getenv("CELERY_LIVE_QUEUE", "stt_live")
+BULK_QUEUE = os.getenv("CELERY_BULK_QUEUE", "stt_bulk")
+# 이 길이(초) 이하의 녹음은 live 큐에서 처리
+LIVE_MAX_RECORDING_SECONDS = float(os.getenv("LIVE_MAX_RECORDING_SECONDS", "300"))
+# 워커 프로세스당 미리 가져오는 메시지 수 (긴 작업 뒤에 다른 작업이 묶여 기다리지 않도록 1)
+CELERY_PREFETCH_MULTIPLIER = int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "1"))
+# 메시지 우선순위 범위 (0 ~ MAX_PRIORITY, 클수록 먼저 처리, RabbitMQ x-max-priority)
+MAX_PRIORITY = 9
+DEFAULT_PRIORITY = 5
+
+app = Celery(
+    "audio_tasks",
+    broker=CELERY_BROKER_URL,
+    backend=CELERY_BACKEND_URL,
+    include=["app.tasks.tasks", "app.api.audio_recording"]
+)
+
+app.conf.update(
+    task_queues=[
+        Queue(LIVE_QUEUE, routing_key=LIVE_QUEUE, queue_arguments={"x-max-priority": MAX_PRIORITY}),
+        Queue(BULK_QUEUE, routing_key=BULK_QUEUE, queue_arguments={"x-max-priority": MAX_PRIORITY}),
+    ],
+    task_default_queue=BULK_QUEUE,
+    task_routes={
+        "app.api.audio_recording.transcribe_segment_task": {"queue": LIVE_QUEUE},
+        "app.api.audio_recording.process_audio_task": {"queue": BULK_QUEUE},
+        "app.tasks.tasks.*": {"queue": BULK_QUEUE},
+    },
+    task_queue_max_priority=MAX_PRIORITY,
+    task_default_priority=DEFAULT_PRIORITY,
+    worker_prefetch_multiplier=CELERY_PREFETCH_MULTIPLIER,
+    # acks_late 작업은 워커가 죽으면 다른 워커로 재전달
+    task_reject_on_worker_lost=True,
+)
+
+
+def route_recording(seconds):
+    """
+    녹음 길이에 따라 전사 작업의 큐와 우선순위를 결정 (apply_async 인자로 사용)
+    짧은 녹음은 live 큐에서 높은 우선순위로, 긴 녹음은 bulk 큐에서 길수록 낮은 우선순위로 처리한다.
+    """
+    if seconds <= LIVE_MAX_RECORDING_SECONDS:
+        return {"queue": LIVE_QUEUE, "priority": MAX_PRIORITY}
+    # bulk 큐 안에서는 10분마다 우선순위 1씩 낮춤
+    priority = max(0, DEFAULT_PRIORITY - int(seconds // 600))
+    return {"queue": BULK_QUEUE, "priority": priority}
+
+
+@before_task_publish.connect
+def stamp_enqueued_at(headers=None, **kwargs):
+    # 워커가 큐 대기 시간을 측정할 수 있도록 발행 시각 기록
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+def queue_depths():
+    """
+    각 큐에 쌓인 메시지 수와 소비 중인 워커 수 (브로커에 passive declare로 조회)
+    """
+    depths = {}
+    with app.connection_for_read() as connection:
+        for queue in (LIVE_QUEUE, BULK_QUEUE):
+            channel = connection.channel()
+            try:
+                _, messages, consumers = channel.queue_declare(queue, passive=True)
+                depths[queue] = {"messages": messages, "consumers": consumers}
+            except Exception as e:
+                # 아직 선언되지 않은 큐 (워커가 한 번도 뜨지 않음)
+                depths[queue] = {"messages": None, "consumers": 0, "error": str(e)}
+            finally:
+                try:
+                    channel.close()
+                except Exception:
+                    pass
+    return depths
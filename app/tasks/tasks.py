@@ -1,10 +1,27 @@
 import os
-import ffmpeg
+import time
+import logging
+import threading
+from celery import current_task
+from celery.signals import (
+    setup_logging as celery_setup_logging, worker_ready, worker_process_shutdown, task_prerun, task_postrun
+)
 from app.tasks.celery_app import app as celery_app
-from minio import Minio
-import openai
-import glob
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from app.utils.storage import open_object
+from app.utils.audio import iter_speech_wav_segments, SEGMENT_SECONDS
+from app.utils.stt_cache import cache_stats
+from app.utils.stt import transcribe
+from app.utils.conversations import save_transcript_segments
+from app.utils.keywords import extract_meeting_keywords, backfill_keywords
+from app.utils.archive import archive_recording, recording_object_name
+from app.utils.job_events import JobProgress
+from app.utils.logging_config import setup_logging
+from app.utils.metrics import (
+    track_iter, record_audio_seconds, start_metrics_server, mark_process_dead,
+    TASKS_IN_FLIGHT, TASK_QUEUE_WAIT_SECONDS,
+)
 
 # Docker 환경인지 확인
 IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
@@ -12,64 +29,167 @@ IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
 if not IS_DOCKER:
     load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
 
-# MinIO 설정
-MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT")
-MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
-MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
-MINIO_BUCKET_NAME = os.getenv("MINIO_BUCKET_NAME")
-
-minio_client = Minio(
-    MINIO_ENDPOINT,
-    access_key=MINIO_ACCESS_KEY,
-    secret_key=MINIO_SECRET_KEY,
-    secure=False
-)
+# 워커 /metrics 포트
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "9100"))
+
+logger = logging.getLogger(__name__)
+
+@celery_setup_logging.connect
+def configure_worker_logging(**kwargs):
+    # Celery 기본 로그 설정 대신 공통 로그 설정(JSON 레코드) 사용
+    # 이 시그널은 prefork 부모에서 fork 전에 실행되므로 리스너 스레드가 필요 없는 StreamHandler로 출력
+    setup_logging(queued=False)
+
+@worker_ready.connect
+def start_worker_metrics(**kwargs):
+    # 작업 지표는 prefork 자식 프로세스에서 기록되므로 PROMETHEUS_MULTIPROC_DIR을 설정해야 부모의 /metrics에 합쳐짐
+    # (Dockerfile.celery에서 설정하고 시작할 때 비움, 설정하지 않으면 --pool=threads 또는 solo로 실행)
+    start_metrics_server(WORKER_METRICS_PORT)
+    logger.info(f"📈 Worker metrics on :{WORKER_METRICS_PORT}/metrics")
+
+@worker_process_shutdown.connect
+def remove_worker_process_metrics(pid=None, **kwargs):
+    # 교체된 자식 프로세스의 게이지(진행 중 작업 수 등)가 합계에 남지 않게 함
+    mark_process_dead(pid or os.getpid())
+
+@task_prerun.connect
+def task_started(task=None, **kwargs):
+    TASKS_IN_FLIGHT.labels(task.name).inc()
+    # 발행 시각(celery_app.stamp_enqueued_at)부터 실행 시작까지의 큐 대기 시간
+    request = task.request
+    enqueued_at = request.get("enqueued_at") or (request.headers or {}).get("enqueued_at")
+    if enqueued_at:
+        queue = (request.delivery_info or {}).get("routing_key") or "unknown"
+        TASK_QUEUE_WAIT_SECONDS.labels(queue).observe(max(0.0, time.time() - enqueued_at))
+
+@task_postrun.connect
+def task_finished(task=None, **kwargs):
+    TASKS_IN_FLIGHT.labels(task.name).dec()
 
-# OpenAI API Key 설정
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# 청크 전사 동시 실행 수 (실제 API 동시 요청 수는 STT 클라이언트가 추가로 제한)
+STT_CONCURRENCY = int(os.getenv("STT_CONCURRENCY", "4"))
 
-@celery_app.task
-def convert_and_transcribe(file_name):
+def transcribe_segments(file_name, segments, on_chunk_done=None):
     """
-    MinIO에서 WebM 파일을 가져와 WAV로 변환 후 Whisper API로 텍스트 변환하는 Celery Task
-    긴 오디오는 일정한 길이로 나눈 후 개별적으로 Whisper API에 전송.
+    (index, offset, wav_data) 세그먼트를 스레드 풀에서 병렬 변환하고 (offset, text)를 세그먼트 순서대로 반환
+    메모리에는 동시 실행 수의 두 배까지만 세그먼트를 유지한다.
+    on_chunk_done(index, offset)은 세그먼트 전사가 성공할 때마다 (완료 순서대로) 호출된다.
     """
-    webm_path = f"./recordings/{file_name}.webm"
-    wav_path = f"./recordings/{file_name}.wav"
-    output_dir = f"./recordings/{file_name}_chunks/"
-
-    # MinIO에서 WebM 다운로드
-    minio_client.fget_object(MINIO_BUCKET_NAME, f"{file_name}.webm", webm_path)
-
-    # WebM -> WAV 변환 (ffmpeg-python 사용)
-    ffmpeg.input(webm_path).output(
-        wav_path, 
-        acodec="pcm_s16le", ac=1, ar="44100"
-    ).run(overwrite_output=True)
-
-    # WAV 파일을 일정 길이(예: 30초)로 나누기
-    os.makedirs(output_dir, exist_ok=True)
-    chunk_pattern = os.path.join(output_dir, f"{file_name}_%03d.wav")
-    ffmpeg.input(wav_path).output(
-        chunk_pattern, f="segment", segment_time="30", c="copy"
-    ).run(overwrite_output=True)
-
-    # 생성된 청크 파일 리스트 가져오기
-    chunk_files = sorted(glob.glob(os.path.join(output_dir, "*.wav")))
-
-    # Whisper API로 각 오디오 청크를 변환
-    full_transcription = ""
-    for chunk in chunk_files:
-        try:
-            with open(chunk, "rb") as audio_file:
-                response = openai.Audio.transcribe(
-                    model="whisper-1",
-                    file=audio_file
+    concurrency = max(1, STT_CONCURRENCY)
+    slots = threading.BoundedSemaphore(concurrency * 2)
+    chunks = []
+    offsets = []
+    futures = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index, offset, wav_data in segments:
+            slots.acquire()
+            chunk = f"{file_name}_{index:03d}.wav"
+            future = executor.submit(transcribe, wav_data, chunk)
+            future.add_done_callback(lambda _: slots.release())
+            if on_chunk_done:
+                future.add_done_callback(
+                    lambda f, index=index, offset=offset: f.exception() is None and on_chunk_done(index, offset)
                 )
-            transcript = response.get("text", "")
-            full_transcription += transcript + " "
+            chunks.append(chunk)
+            offsets.append(offset)
+            futures.append(future)
 
+    transcripts = []
+    failed_chunks = []
+    for chunk, offset, future in zip(chunks, offsets, futures):
+        try:
+            transcripts.append((offset, future.result()))
         except Exception as e:
-            print(f"❌ Error transcribing chunk {chunk}: {e}")
+            logger.error(f"❌ Error transcribing chunk {chunk}: {e}")
+            failed_chunks.append(chunk)
+
+    if failed_chunks:
+        raise RuntimeError(f"Failed to transcribe {len(failed_chunks)} chunk(s): {failed_chunks}")
+
+    return transcripts
+
+# acks_late 작업은 워커가 죽으면 재전달되므로 다시 실행해도 결과가 같아야 함
+# (대화 저장은 녹음별 교체, 키워드는 증감분 반영, 보관은 이미 끝났으면 건너뜀)
+@celery_app.task(acks_late=True)
+def convert_and_transcribe(file_name, meeting_id=None):
+    """
+    MinIO의 WebM을 16kHz mono 세그먼트로 변환 후 Whisper API로 텍스트 변환하는 Celery Task
+    (업로드 경로의 process_audio_task와 같은 run_transcription 파이프라인 사용)
+    """
+    return run_transcription(file_name, meeting_id)
+
+def run_transcription(file_id, meeting_id=None):
+    """
+    녹음 하나의 전사 파이프라인: 변환 → 세그먼트 분할 → 병렬 전사 → 대화 저장 → 보관
+    현재 실행 중인 작업의 id로 진행 이벤트(started, converted, chunk, saved, done/failed)를 발행한다.
+
+    get_object 스트림을 ffmpeg stdin으로 바로 흘려보내 디코딩/리샘플링하므로 로컬 디스크를 쓰지 않고,
+    VAD로 목표 길이 부근의 쉼에서 분할하며 무음 구간은 Whisper API로 보내지 않음.
+    meeting_id가 주어지면 세그먼트별 전사 결과를 conversations 테이블에 일괄 저장.
+    """
+    progress = JobProgress(current_task.request.id)
+    progress.publish("started", file_id=file_id)
+    try:
+        transcription = _transcribe_recording(file_id, meeting_id, progress)
+    except Exception as e:
+        progress.failed(e)
+        raise
+    progress.done(transcription)
+    return transcription
+
+def _transcribe_recording(file_id, meeting_id, progress):
+    stats = {}
+
+    def decoded(segments):
+        count = 0
+        for segment in segments:
+            count += 1
+            yield segment
+        # 디코딩이 끝나야 전체 세그먼트 수를 알 수 있음 (이후 chunk 이벤트에 total 포함)
+        progress.converted(count, stats)
+
+    with open_object(recording_object_name(file_id)) as webm_stream:
+        segments = track_iter(iter_speech_wav_segments(webm_stream, SEGMENT_SECONDS, stats=stats), "decode")
+        transcripts = transcribe_segments(file_id, decoded(segments), progress.chunk_done)
+    record_audio_seconds(stats)
+    logger.info(
+        f"🔇 Skipped {stats['skipped_seconds']:.1f}s of silence out of {stats['total_seconds']:.1f}s",
+        extra={"file_id": file_id, **stats}
+    )
+    logger.info("🗃️ STT cache", extra=cache_stats())
+
+    if meeting_id is not None:
+        saved = save_transcript_segments(meeting_id, transcripts, file_id)
+        logger.info(f"💾 Saved {saved} conversation(s) for meeting {meeting_id}")
+        progress.publish("saved", meeting_id=meeting_id, conversations=saved)
+        if saved:
+            extract_keywords.delay(meeting_id)
+
+    # 전사가 끝난 원본 WebM은 보관용 Opus로 바꿔 저장 (재생은 GET /meetings/{meeting_id}/audio)
+    archive_audio.delay(file_id, meeting_id)
+
+    return " ".join(text for _, text in transcripts if text).strip()
 
-    return full_transcription.strip()
+@celery_app.task(acks_late=True)
+def extract_keywords(meeting_id):
+    """
+    회의 대화에서 TF-IDF 상위 키워드/핵심 주제를 추출해 keywords, key_topics 테이블에 저장하는 Celery Task
+    말뭉치 문서 빈도는 이 회의의 증감분만 반영해 갱신
+    """
+    keywords, topics = extract_meeting_keywords(meeting_id)
+    logger.info(f"🏷️ Meeting {meeting_id} keywords: {keywords}, key topics: {topics}")
+    return {"keywords": keywords, "key_topics": topics}
+
+@celery_app.task(acks_late=True)
+def backfill_meeting_keywords(meeting_ids=None):
+    """
+    기존 회의(기본: 전체)의 키워드를 배치 단위로 일괄 계산하는 Celery Task
+    """
+    return backfill_keywords(meeting_ids)
+
+@celery_app.task(acks_late=True)
+def archive_audio(file_name, meeting_id=None):
+    """
+    전사가 끝난 녹음을 시간 색인이 있는 Opus로 변환해 보관하고 원본 WebM을 삭제하는 Celery Task
+    """
+    return archive_recording(file_name, meeting_id)
@@ -0,0 +1,205 @@
+# /utils/archive.py
+import io
+import os
+import json
+import struct
+import logging
+from dotenv import load_dotenv
+from sqlalchemy import update
+from minio.error import S3Error
+
+from app.utils.audio import ffmpeg_pipe, ffmpeg_opus_command
+from app.utils.database import SessionLocal
+from app.utils.ingest import MIN_PART_SIZE
+from app.utils.metrics import track_stage
+from app.utils.models import Meeting, bump_meeting_version
+from app.utils.storage import get_minio_client, open_object, MINIO_BUCKET_NAME
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# 보관용 오디오 설정
+# 음성 mono Opus 24kbps는 1분에 약 180KB (44.1kHz 16bit WAV의 약 1/28)
+AUDIO_ARCHIVE_BITRATE = os.getenv("AUDIO_ARCHIVE_BITRATE", "24k")
+# 색인 지점 사이의 최소 간격 (초), 작을수록 정확히 찾아가지만 색인이 커짐
+AUDIO_SEEK_INTERVAL = float(os.getenv("AUDIO_SEEK_INTERVAL", "5"))
+ARCHIVE_CONTENT_TYPE = "audio/ogg; codecs=opus"
+
+# Ogg 페이지 헤더: "OggS", 버전, 헤더 타입, granule 위치, 스트림 serial, 페이지 순번, CRC, 세그먼트 수
+OGG_PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+# Opus granule 위치는 입력 샘플링 레이트와 관계없이 항상 48kHz 기준
+OPUS_GRANULE_RATE = 48000
+
+logger = logging.getLogger(__name__)
+
+
+def archive_object_name(file_id):
+    return f"{file_id}.opus"
+
+
+def index_object_name(object_name):
+    return f"{object_name}.index.json"
+
+
+def recording_object_name(file_id):
+    """
+    전사/보관에 사용할 녹음 객체 이름
+    원본 WebM이 이미 보관용 Opus로 바뀌어 삭제되었으면 보관 객체를 사용한다 (작업 재전달, 재처리)
+    """
+    webm_name = f"{file_id}.webm"
+    try:
+        get_minio_client().stat_object(MINIO_BUCKET_NAME, webm_name)
+    except S3Error as e:
+        if e.code == "NoSuchKey":
+            return archive_object_name(file_id)
+        raise
+    return webm_name
+
+
+class OggSeekIndex:
+    """
+    Ogg Opus 스트림이 지나가는 대로 페이지 헤더를 읽어 시간(초) → 바이트 오프셋 색인을 만듦
+    각 지점은 그 시각부터 재생되는 페이지의 시작 위치이므로,
+    헤더 구간(0 ~ header_bytes)과 지점 이후 구간만 Range로 받아 이어 붙이면 바로 디코딩할 수 있다.
+    """
+
+    def __init__(self, interval=AUDIO_SEEK_INTERVAL):
+        self.interval = interval
+        self.points = []
+        self.header_bytes = None
+        self.pre_skip = 0
+        self.duration = 0.0
+        self.size = 0
+        self._pending = bytearray()
+        self._page_offset = 0
+
+    def feed(self, data):
+        self.size += len(data)
+        self._pending += data
+        while len(self._pending) >= OGG_PAGE_HEADER.size:
+            capture, _, _, granule, _, _, _, segments = OGG_PAGE_HEADER.unpack_from(self._pending)
+            if capture != b"OggS":
+                raise ValueError(f"Invalid Ogg page at byte {self._page_offset}")
+            body_from = OGG_PAGE_HEADER.size + segments
+            if len(self._pending) < body_from:
+                return
+            page_size = body_from + sum(self._pending[OGG_PAGE_HEADER.size:body_from])
+            if len(self._pending) < page_size:
+                return
+            self._on_page(granule, bytes(self._pending[body_from:page_size]))
+            del self._pending[:page_size]
+            self._page_offset += page_size
+
+    def _on_page(self, granule, body):
+        # 오디오 이전의 OpusHead/OpusTags 헤더 페이지는 granule이 0
+        if self.header_bytes is None and granule == 0:
+            if body.startswith(b"OpusHead"):
+                self.pre_skip = struct.unpack_from("<H", body, 10)[0]
+            return
+        if self.header_bytes is None:
+            self.header_bytes = self._page_offset
+        # 페이지의 재생 시작 시각 = 이전 페이지의 마지막 granule 위치
+        start = self.duration
+        if not self.points or start - self.points[-1][0] >= self.interval:
+            self.points.append((round(start, 3), self._page_offset))
+        # granule -1: 이 페이지에서 끝나는 패킷이 없음 (다음 페이지로 이어짐)
+        if granule >= 0:
+            self.duration = max(0.0, (granule - self.pre_skip) / OPUS_GRANULE_RATE)
+
+    def to_dict(self):
+        return {
+            "content_type": ARCHIVE_CONTENT_TYPE,
+            "size": self.size,
+            "duration": round(self.duration, 3),
+            "header_bytes": self.header_bytes or 0,
+            "points": self.points,
+        }
+
+
+class _IndexingReader:
+    """
+    put_object가 읽어 가는 인코딩 결과를 그대로 전달하면서 색인을 만듦
+    """
+
+    def __init__(self, stream, index):
+        self._stream = stream
+        self._index = index
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        self._index.feed(data)
+        return data
+
+
+def set_meeting_audio(meeting_id, object_name):
+    db = SessionLocal()
+    try:
+        with track_stage("db_write"):
+            db.execute(update(Meeting).where(Meeting.id == meeting_id).values(audio_url=object_name))
+            db.execute(bump_meeting_version(meeting_id))
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def archive_recording(file_id, meeting_id=None, remove_source=True):
+    """
+    MinIO의 원본 WebM을 보관용 Opus로 인코딩해 시간 색인과 함께 업로드
+    인코딩 결과는 ffmpeg stdout에서 멀티파트 업로드로 바로 흘려보내므로 로컬 디스크를 쓰지 않는다.
+    meeting_id가 주어지면 회의의 audio_url을 보관 객체로 바꾸고, 업로드가 끝나면 원본 WebM은 삭제한다.
+    """
+    client = get_minio_client()
+    object_name = archive_object_name(file_id)
+    if recording_object_name(file_id) == object_name:
+        # 이전 실행이 원본 삭제까지 마친 뒤 재전달된 작업: 색인은 이미 있으므로 회의 연결만 보장
+        if meeting_id is not None:
+            set_meeting_audio(meeting_id, object_name)
+        summary = load_seek_index(object_name)
+        return {"object_name": object_name, "size": summary["size"], "duration": summary["duration"]}
+
+    index = OggSeekIndex()
+    try:
+        with track_stage("archive_encode"):
+            with open_object(f"{file_id}.webm") as webm_stream:
+                with ffmpeg_pipe(ffmpeg_opus_command(AUDIO_ARCHIVE_BITRATE), webm_stream) as opus_stream:
+                    client.put_object(
+                        MINIO_BUCKET_NAME, object_name, _IndexingReader(opus_stream, index),
+                        length=-1, part_size=MIN_PART_SIZE, content_type=ARCHIVE_CONTENT_TYPE,
+                    )
+    except Exception:
+        # 인코딩이 중간에 실패했으면 잘린 보관 파일을 남기지 않음 (원본 WebM은 유지)
+        try:
+            client.remove_object(MINIO_BUCKET_NAME, object_name)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to remove partial archive {object_name}: {e}")
+        raise
+
+    index_data = json.dumps(index.to_dict()).encode()
+    client.put_object(
+        MINIO_BUCKET_NAME, index_object_name(object_name), io.BytesIO(index_data), len(index_data),
+        content_type="application/json",
+    )
+    if meeting_id is not None:
+        set_meeting_audio(meeting_id, object_name)
+    if remove_source:
+        client.remove_object(MINIO_BUCKET_NAME, f"{file_id}.webm")
+
+    logger.info(
+        f"🗜️ Archived {file_id} as {object_name}: {index.size} bytes, {index.duration:.1f}s",
+        extra={"file_id": file_id, "meeting_id": meeting_id, "points": len(index.points)}
+    )
+    return {"object_name": object_name, "size": index.size, "duration": round(index.duration, 3)}
+
+
+def load_seek_index(object_name):
+    """
+    보관 객체의 시간 색인을 MinIO에서 읽어 반환
+    """
+    with open_object(index_object_name(object_name)) as response:
+        return json.loads(response.read())
@@ -0,0 +1,239 @@
+# /utils/audio.py
+import io
+import wave
+import shutil
+import threading
+import subprocess
+import numpy as np
+from contextlib import contextmanager
+
+# Whisper가 내부적으로 사용하는 샘플링 레이트 (16kHz mono 16bit)
+STT_SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+# 기본 세그먼트 길이 (초)
+SEGMENT_SECONDS = 30
+
+
+def ffmpeg_decode_command(sample_rate=STT_SAMPLE_RATE):
+    """
+    stdin으로 받은 오디오를 한 번에 디코딩/리샘플링하여 stdout으로 raw PCM(s16le, mono)을 내보내는 ffmpeg 명령
+    """
+    return [
+        "ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate),
+        "pipe:1",
+    ]
+
+
+def ffmpeg_opus_command(bitrate):
+    """
+    stdin으로 받은 오디오를 보관용 mono Opus(Ogg 컨테이너)로 인코딩해 stdout으로 내보내는 ffmpeg 명령
+    (Ogg 페이지마다 재생 위치(granule)가 기록되어 페이지 경계 기준 시간 → 바이트 색인을 만들 수 있음)
+    """
+    return [
+        "ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-vn",
+        "-ac", "1", "-c:a", "libopus", "-b:a", bitrate, "-application", "voip",
+        "-f", "ogg", "pipe:1",
+    ]
+
+
+def pcm_to_wav(pcm, sample_rate=STT_SAMPLE_RATE):
+    """
+    raw PCM(s16le, mono) 바이트에 WAV 헤더를 붙여 반환
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(SAMPLE_WIDTH)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _feed_stdin(stdin, source, errors):
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            stdin.write(source)
+        else:
+            shutil.copyfileobj(source, stdin, 64 * 1024)
+    except BrokenPipeError:
+        pass  # 소비자가 먼저 읽기를 중단한 경우
+    except Exception as e:
+        # source(MinIO 스트림 등) 읽기 실패: 잘린 입력을 정상 결과로 취급하지 않도록 호출자에게 전달
+        errors.append(e)
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+@contextmanager
+def ffmpeg_pipe(command, source):
+    """
+    source(파일 객체 또는 바이트)를 별도 스레드에서 ffmpeg stdin으로 흘려보내고 stdout을 반환
+    블록이 정상 종료되면 source 읽기 실패나 ffmpeg 오류를 RuntimeError로 알린다.
+    """
+    process = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    feed_errors = []
+    feeder = threading.Thread(target=_feed_stdin, args=(process.stdin, source, feed_errors), daemon=True)
+    feeder.start()
+    try:
+        yield process.stdout
+    finally:
+        process.stdout.close()
+        feeder.join()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        returncode = process.wait()
+
+    if feed_errors:
+        raise RuntimeError(f"Failed to read audio source: {feed_errors[0]}") from feed_errors[0]
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed ({returncode}): {stderr.decode(errors='replace').strip()}")
+
+
+def iter_pcm_segments(source, segment_seconds=SEGMENT_SECONDS, sample_rate=STT_SAMPLE_RATE):
+    """
+    source(파일 객체 또는 바이트)를 ffmpeg 한 번의 실행으로 디코딩/리샘플링하고
+    segment_seconds 단위의 PCM으로 잘라 (index, offset, pcm)을 순서대로 반환
+    중간 WAV 파일 없이 파이프로만 처리하며 메모리에는 세그먼트 하나만 유지한다.
+    source는 read()가 있으면 되므로 MinIO get_object 응답을 그대로 넘겨 디스크 없이 스트리밍할 수 있다.
+    """
+    segment_bytes = int(segment_seconds * sample_rate) * SAMPLE_WIDTH
+    with ffmpeg_pipe(ffmpeg_decode_command(sample_rate), source) as stdout:
+        index = 0
+        while True:
+            pcm = stdout.read(segment_bytes)
+            if not pcm:
+                break
+            yield index, index * segment_seconds, pcm
+            index += 1
+
+
+def iter_wav_segments(source, segment_seconds=SEGMENT_SECONDS, sample_rate=STT_SAMPLE_RATE):
+    """
+    iter_pcm_segments와 같으나 각 세그먼트를 STT에 바로 보낼 수 있는 WAV 바이트로 반환
+    """
+    for index, offset, pcm in iter_pcm_segments(source, segment_seconds, sample_rate):
+        yield index, offset, pcm_to_wav(pcm, sample_rate)
+
+
+# VAD 설정: 프레임 길이, 음성으로 판단할 최소 에너지(dBFS), 음성 앞뒤로 남길 여유 구간
+VAD_FRAME_MS = 30
+VAD_THRESHOLD_DB = -45.0
+VAD_PADDING_SECONDS = 0.3
+# ffmpeg 파이프에서 한 번에 읽어 들일 PCM 길이 (초)
+VAD_READ_SECONDS = 5
+
+
+def frame_energy_db(samples, frame_len):
+    """
+    int16 샘플 배열을 frame_len 단위 프레임으로 나누어 프레임별 RMS 에너지(dBFS)를 계산
+    """
+    n_frames = len(samples) // frame_len
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(np.square(frames / 32768.0), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def _split_speech(samples, frame_len, target_frames, final, threshold_db, pad_frames):
+    """
+    버퍼 앞부분에서 음성 세그먼트 하나를 찾아 (start, end, consumed)를 반환 (프레임 단위)
+    음성이 없으면 start/end가 None이며, 판단에 데이터가 더 필요하면 None을 반환
+    """
+    energy = frame_energy_db(samples, frame_len)
+    n_frames = len(energy)
+    voiced = np.flatnonzero(energy > threshold_db)
+    if len(voiced) == 0:
+        # 버퍼 전체가 무음: 마지막 패딩 구간만 남기고 버림
+        consumed = n_frames if final else max(0, n_frames - pad_frames)
+        return None, None, int(consumed)
+
+    start = max(0, voiced[0] - pad_frames)
+    search_from = start + target_frames // 2
+    search_to = start + target_frames + target_frames // 2
+    if search_to > n_frames:
+        if not final:
+            return None
+        search_to = n_frames
+
+    if search_from >= search_to or final and search_to - start <= target_frames:
+        cut = search_to
+    else:
+        # 목표 길이 부근의 쉼(무음 프레임) 중 목표 지점에 가장 가까운 곳에서 자름 (거리가 같으면 더 조용한 곳)
+        # 쉼이 없으면(계속 말하는 중) 목표 지점에서 자름
+        window = max(1, int(300 / VAD_FRAME_MS))
+        smoothed = np.convolve(energy, np.ones(window) / window, mode="same")[search_from:search_to]
+        target = min(start + target_frames, search_to - 1)
+        quiet = np.flatnonzero(smoothed <= threshold_db)
+        if len(quiet) == 0:
+            cut = target
+        else:
+            distance = np.abs(search_from + quiet - target)
+            cut = search_from + int(quiet[np.lexsort((smoothed[quiet], distance))[0]])
+        cut = max(cut, start + 1)
+
+    # 세그먼트 끝의 무음은 패딩만 남기고 제외
+    last_voiced = voiced[voiced < cut]
+    end = min(cut, last_voiced[-1] + 1 + pad_frames) if len(last_voiced) else cut
+    return int(start), int(end), int(cut)
+
+
+def iter_speech_segments(source, target_seconds=SEGMENT_SECONDS, sample_rate=STT_SAMPLE_RATE,
+                         threshold_db=VAD_THRESHOLD_DB, stats=None):
+    """
+    source를 16kHz mono PCM으로 디코딩하면서 프레임 에너지 기반 VAD로 목표 길이 부근의 쉼에서 분할
+    무음 구간과 무음만 있는 세그먼트는 STT로 보내지 않고 건너뛰며,
+    stats(dict)가 주어지면 total_seconds / skipped_seconds 를 기록한다.
+    (index, offset, pcm)을 순서대로 반환하며 offset은 원본 녹음 기준 초 단위 위치.
+    """
+    frame_len = int(sample_rate * VAD_FRAME_MS / 1000)
+    target_frames = int(target_seconds * 1000 / VAD_FRAME_MS)
+    pad_frames = int(VAD_PADDING_SECONDS * 1000 / VAD_FRAME_MS)
+    if stats is None:
+        stats = {}
+    stats["total_seconds"] = 0.0
+    stats["skipped_seconds"] = 0.0
+
+    buffer = np.empty(0, dtype=np.int16)
+    buffer_offset = 0  # buffer[0]의 원본 기준 샘플 위치
+    index = 0
+
+    def drain(final):
+        nonlocal buffer, buffer_offset, index
+        while len(buffer) >= frame_len:
+            result = _split_speech(buffer, frame_len, target_frames, final, threshold_db, pad_frames)
+            if result is None:
+                return
+            start, end, consumed = result
+            if start is None:
+                stats["skipped_seconds"] += consumed * frame_len / sample_rate
+            else:
+                stats["skipped_seconds"] += ((start + consumed - end) * frame_len) / sample_rate
+                pcm = buffer[start * frame_len:end * frame_len].tobytes()
+                yield index, (buffer_offset + start * frame_len) / sample_rate, pcm
+                index += 1
+            if consumed == 0:
+                return
+            buffer = buffer[consumed * frame_len:]
+            buffer_offset += consumed * frame_len
+
+    for _, _, pcm in iter_pcm_segments(source, VAD_READ_SECONDS, sample_rate):
+        stats["total_seconds"] += len(pcm) / SAMPLE_WIDTH / sample_rate
+        buffer = np.concatenate([buffer, np.frombuffer(pcm, dtype=np.int16)])
+        yield from drain(final=False)
+    yield from drain(final=True)
+    # 프레임 길이에 못 미치는 마지막 꼬리는 버림
+    stats["skipped_seconds"] += len(buffer) / sample_rate
+
+
+def iter_speech_wav_segments(source, target_seconds=SEGMENT_SECONDS, sample_rate=STT_SAMPLE_RATE,
+                             stats=None):
+    """
+    iter_speech_segments와 같으나 각 세그먼트를 WAV 바이트로 반환
+    """
+    for index, offset, pcm in iter_speech_segments(source, target_seconds, sample_rate, stats=stats):
+        yield index, offset, pcm_to_wav(pcm, sample_rate)
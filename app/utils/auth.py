@@ -1,7 +1,10 @@
 # /utils/auth.py
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
 from passlib.context import CryptContext
 
 # OAuth2
@@ -21,6 +24,10 @@ SECRET_KEY = os.getenv("JWT_SECRET")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# bcrypt 전용 스레드 풀 크기와 대기열 상한 (상한을 넘으면 즉시 503 응답)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -29,3 +36,75 @@ def verify_password(plain_password, hashed_password):
 
 def get_password_hash(password):
     return pwd_context.hash(password)
+
+
+class PasswordHashPool:
+    """
+    bcrypt 해시/검증을 이벤트 루프 밖의 고정 크기 스레드 풀에서 실행
+    대기 중+실행 중인 작업이 max_queue에 도달하면 새 요청은 503으로 즉시 거절한다.
+    """
+
+    def __init__(self, workers, max_queue):
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    def _run(self, func, args, submitted_at):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._wait_total += started_at - submitted_at
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+                self._run_total += elapsed
+                self._run_max = max(self._run_max, elapsed)
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, func, args, time.perf_counter())
+
+    def stats(self):
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "utilization": self._running / self.workers,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": self._wait_total / completed if completed else 0.0,
+                "avg_run_seconds": self._run_total / completed if completed else 0.0,
+                "max_run_seconds": self._run_max,
+            }
+
+
+password_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+async def verify_password_async(plain_password, hashed_password):
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await password_pool.run(get_password_hash, password)
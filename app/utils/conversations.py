@@ -0,0 +1,85 @@
+# /utils/conversations.py
+import os
+from dotenv import load_dotenv
+from sqlalchemy import delete
+
+from app.utils.database import SessionLocal
+from app.utils.models import Conversation, bump_meeting_version
+from app.utils.metrics import track_stage
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# 한 번의 INSERT 문에 담을 최대 대화 행 수
+CONVERSATION_BATCH_SIZE = int(os.getenv("CONVERSATION_BATCH_SIZE", "500"))
+# 화자 분리가 없을 때 사용하는 화자 이름
+DEFAULT_SPEAKER = "unknown"
+
+
+def format_time_stamp(offset):
+    """
+    녹음 시작 기준 오프셋(초)을 HH:MM:SS 형식의 time_stamp로 변환
+    """
+    seconds = int(offset)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def bulk_insert_conversations(db, rows):
+    """
+    대화 행(dict) 목록을 CONVERSATION_BATCH_SIZE 단위의 다중 행 INSERT로 추가 (커밋은 호출자가 수행)
+    """
+    table = Conversation.__table__
+    for start in range(0, len(rows), CONVERSATION_BATCH_SIZE):
+        db.execute(table.insert(), rows[start:start + CONVERSATION_BATCH_SIZE])
+    return len(rows)
+
+
+async def bulk_insert_conversations_async(db, rows):
+    """
+    bulk_insert_conversations의 AsyncSession 버전 (API 라우터용)
+    """
+    table = Conversation.__table__
+    for start in range(0, len(rows), CONVERSATION_BATCH_SIZE):
+        await db.execute(table.insert(), rows[start:start + CONVERSATION_BATCH_SIZE])
+    return len(rows)
+
+
+def save_transcript_segments(meeting_id, segments, file_id, speaker=DEFAULT_SPEAKER):
+    """
+    워커에서 전사된 (offset, text) 세그먼트들을 한 트랜잭션으로 conversations 테이블에 저장
+    같은 녹음(file_id)에서 이전에 저장한 행을 같은 트랜잭션에서 먼저 지우므로
+    작업이 재전달/재처리되어도 대화 기록이 중복되지 않는다.
+    """
+    rows = [
+        {
+            "meeting_id": meeting_id,
+            "speaker": speaker,
+            "time_stamp": format_time_stamp(offset),
+            "content": text.strip(),
+            "color": None,
+            "file_id": file_id,
+        }
+        for offset, text in segments
+        if text and text.strip()
+    ]
+
+    db = SessionLocal()
+    try:
+        with track_stage("db_write"):
+            db.execute(
+                delete(Conversation).where(
+                    Conversation.meeting_id == meeting_id, Conversation.file_id == file_id
+                )
+            )
+            bulk_insert_conversations(db, rows)
+            db.execute(bump_meeting_version(meeting_id))
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return len(rows)
@@ -1,5 +1,7 @@
 # /utils/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -14,17 +16,54 @@ if not IS_DOCKER:
 # .env 파일에서 DATABASE_URL 읽기
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# 데이터베이스 엔진 생성
-engine = create_engine(DATABASE_URL)
+# 커넥션 풀 설정
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # MySQL wait_timeout보다 짧게
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# 비동기 드라이버 매핑 (ASYNC_DATABASE_URL이 없으면 DATABASE_URL에서 유도)
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url):
+    """
+    동기 드라이버 URL(mysql+pymysql 등)을 같은 DB의 비동기 드라이버 URL로 변환
+    """
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+def pool_options(url):
+    # sqlite는 QueuePool 설정을 지원하지 않음
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+# 데이터베이스 엔진 생성 (Celery 워커 등 동기 코드용)
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
 # 세션 로컬 설정
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# API 라우터용 비동기 엔진/세션 (이벤트 루프를 막지 않음)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL))
+AsyncSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 # Base 클래스 생성
 Base = declarative_base()
 
 # 데이터베이스 세션 생성 함수
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,166 @@
+# /utils/ingest.py
+import os
+import queue
+import asyncio
+import threading
+
+# MinIO 멀티파트 업로드의 최소 파트 크기 (5 MiB)
+MIN_PART_SIZE = 5 * 1024 * 1024
+# 업로드 큐가 가득 찼을 때 업로드 스레드 실패 여부를 다시 확인하는 간격 (초)
+QUEUE_POLL_INTERVAL = 1.0
+
+
+class SpoolWriter:
+    """
+    수신한 오디오 프레임을 append-only 스풀 파일에 바로 기록
+    메모리에는 최대 buffer_size 바이트만 유지한다.
+    """
+
+    def __init__(self, path, buffer_size):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._file = open(path, "ab", buffering=0)
+        # 기존 파일에 이어 쓰는 경우(세션 재개) 이미 기록된 크기부터 시작
+        self.total_bytes = os.fstat(self._file.fileno()).st_size
+
+    async def write(self, data):
+        self._buffer += data
+        self.total_bytes += len(data)
+        if len(self._buffer) >= self.buffer_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self._buffer:
+            return
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        await asyncio.to_thread(self._file.write, chunk)
+
+    async def sync(self):
+        """
+        버퍼를 기록하고 fsync 하여 프로세스/서버가 죽어도 남는 바이트 수를 반환
+        """
+        await self.flush()
+        await asyncio.to_thread(os.fsync, self._file.fileno())
+        return self.total_bytes
+
+    async def close(self):
+        await self.flush()
+        self._file.close()
+
+    async def abort(self):
+        self._buffer.clear()
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _QueueReader:
+    """
+    put_object가 읽어갈 수 있도록 큐에 쌓인 청크를 파일 객체처럼 노출
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._pending = bytearray()
+        self._eof = False
+        self.aborted = False
+
+    def read(self, size=-1):
+        while not self._eof and (size < 0 or len(self._pending) < size):
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._eof = True
+                break
+            self._pending += chunk
+        if self.aborted:
+            raise IOError("Audio ingest aborted")
+        # SpoolWriter와 같이 bytearray에서 앞부분만 잘라내 매 read마다 남은 버퍼 전체를 복사하지 않음
+        if size < 0:
+            size = len(self._pending)
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+
+class MinioStreamWriter:
+    """
+    수신한 오디오 프레임을 MinIO 멀티파트 업로드로 바로 전송
+    메모리 사용량은 buffer_size * max_pending + part_size 로 제한된다.
+    """
+
+    def __init__(self, minio_client, bucket_name, object_name, buffer_size,
+                 max_pending=4, part_size=MIN_PART_SIZE):
+        self.object_name = object_name
+        self.buffer_size = buffer_size
+        self.total_bytes = 0
+        self._buffer = bytearray()
+        self._chunks = queue.Queue(maxsize=max_pending)
+        self._reader = _QueueReader(self._chunks)
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._upload,
+            args=(minio_client, bucket_name, object_name, max(part_size, MIN_PART_SIZE)),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _upload(self, minio_client, bucket_name, object_name, part_size):
+        try:
+            minio_client.put_object(
+                bucket_name, object_name, self._reader, length=-1, part_size=part_size
+            )
+        except Exception as e:
+            self._error = e
+            # 남은 청크의 메모리를 해제 (이후 put은 _put()에서 _error를 확인하므로 막히지 않음)
+            while True:
+                try:
+                    self._chunks.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _put(self, chunk):
+        """
+        업로드 큐에 청크를 넣음 (스레드에서 실행)
+        업로드 스레드가 실패해 큐를 더 이상 읽지 않으면 기다리지 않고 그 오류를 발생시킨다.
+        """
+        while True:
+            if self._error:
+                raise self._error
+            try:
+                self._chunks.put(chunk, timeout=QUEUE_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    async def write(self, data):
+        if self._error:
+            raise self._error
+        self._buffer += data
+        self.total_bytes += len(data)
+        if len(self._buffer) >= self.buffer_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self._buffer:
+            return
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        await asyncio.to_thread(self._put, chunk)
+
+    async def close(self):
+        await self.flush()
+        await asyncio.to_thread(self._put, None)
+        await asyncio.to_thread(self._thread.join)
+        if self._error:
+            raise self._error
+
+    async def abort(self):
+        self._buffer.clear()
+        self._reader.aborted = True
+        try:
+            await asyncio.to_thread(self._put, None)
+        except Exception:
+            pass  # 업로드가 이미 실패함: 스레드는 종료되었거나 종료 중
+        await asyncio.to_thread(self._thread.join)
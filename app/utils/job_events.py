@@ -0,0 +1,276 @@
+# /utils/job_events.py
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from dotenv import load_dotenv
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# 작업 진행 이벤트 전달 방식
+# broker: Celery 브로커(RabbitMQ 등)의 fanout exchange로 워커 → API 프로세스에 전달
+# memory: 같은 프로세스 안에서만 전달 (테스트, 벤치마크, eager 모드)
+JOB_EVENTS_URL = os.getenv("JOB_EVENTS_URL") or os.getenv("CELERY_BROKER_URL")
+JOB_EVENTS_BACKEND = os.getenv("JOB_EVENTS_BACKEND", "broker" if JOB_EVENTS_URL else "memory").lower()
+JOB_EVENTS_EXCHANGE = os.getenv("JOB_EVENTS_EXCHANGE", "job_events")
+# 늦게 구독한 클라이언트에게 다시 보내 줄 작업당 최근 이벤트 수, 기록을 유지할 최대 작업 수
+JOB_EVENTS_HISTORY = int(os.getenv("JOB_EVENTS_HISTORY", "100"))
+JOB_EVENTS_MAX_JOBS = int(os.getenv("JOB_EVENTS_MAX_JOBS", "1000"))
+# SSE 연결 유지용 주석 전송 간격 (초), 한 연결의 최대 유지 시간 (초)
+JOB_EVENTS_HEARTBEAT = float(os.getenv("JOB_EVENTS_HEARTBEAT", "15"))
+JOB_EVENTS_STREAM_TIMEOUT = float(os.getenv("JOB_EVENTS_STREAM_TIMEOUT", "3600"))
+
+# 이 단계 이후로는 이벤트가 없으므로 구독을 종료
+TERMINAL_STAGES = {"done", "failed"}
+
+logger = logging.getLogger(__name__)
+
+
+class JobEventHub:
+    """
+    API 프로세스 안에서 작업 이벤트를 구독자(SSE 연결)들에게 나눠 주는 허브
+    이벤트는 프로세스당 하나의 수신 경로로만 들어오므로 클라이언트 수와 관계없이 결과 저장소를 폴링하지 않는다.
+    작업별 최근 이벤트를 보관해 늦게 구독한 클라이언트도 지난 진행 상황부터 받을 수 있다.
+    """
+
+    def __init__(self, history_size=JOB_EVENTS_HISTORY, max_jobs=JOB_EVENTS_MAX_JOBS):
+        self.history_size = history_size
+        self.max_jobs = max_jobs
+        self._history = OrderedDict()
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def dispatch(self, event):
+        """
+        이벤트 하나를 기록하고 해당 작업의 구독자 큐에 전달 (어느 스레드에서 호출해도 됨)
+        """
+        task_id = event.get("task_id")
+        with self._lock:
+            history = self._history.get(task_id)
+            if history is None:
+                history = self._history[task_id] = deque(maxlen=self.history_size)
+                while len(self._history) > self.max_jobs:
+                    self._history.popitem(last=False)
+            else:
+                self._history.move_to_end(task_id)
+            history.append(event)
+            subscribers = list(self._subscribers.get(task_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    async def subscribe(self, task_id, heartbeat=JOB_EVENTS_HEARTBEAT, timeout=JOB_EVENTS_STREAM_TIMEOUT):
+        """
+        작업의 지난 이벤트와 이후 이벤트를 순서대로 반환하는 async generator
+        heartbeat 초 동안 이벤트가 없으면 None을 반환하고, 종료 단계 이벤트 후 또는 timeout 초 후에 끝난다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        queue = asyncio.Queue()
+        subscriber = (loop, queue)
+        with self._lock:
+            # 기록 조회와 구독 등록을 같은 락 안에서 해야 그 사이 이벤트가 빠지거나 중복되지 않음
+            history = list(self._history.get(task_id, ()))
+            self._subscribers.setdefault(task_id, set()).add(subscriber)
+        try:
+            for event in history:
+                yield event
+                if event.get("stage") in TERMINAL_STAGES:
+                    return
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), min(heartbeat, remaining))
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event.get("stage") in TERMINAL_STAGES:
+                    return
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(task_id)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[task_id]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "jobs": len(self._history),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+            }
+
+
+class MemoryEventBus:
+    """
+    같은 프로세스의 허브로 바로 전달 (워커와 API가 한 프로세스인 경우)
+    """
+
+    def attach(self, hub):
+        pass  # 발행하는 쪽과 같은 프로세스이므로 별도 수신 경로가 없음
+
+    def publish(self, event):
+        get_job_event_hub().dispatch(event)
+
+
+class BrokerEventBus:
+    """
+    kombu fanout exchange를 통한 전달
+    워커는 비영속 메시지로 발행만 하고, 각 API 프로세스는 전용 임시 큐 하나로 모든 이벤트를 받는다.
+    """
+
+    def __init__(self, url, exchange_name=JOB_EVENTS_EXCHANGE):
+        from kombu import Connection, Exchange  # broker 모드에서만 필요
+
+        self.url = url
+        self.exchange = Exchange(exchange_name, type="fanout", durable=False, delivery_mode=1)
+        self._connection = Connection(url)
+        self.hub = None
+
+    def publish(self, event):
+        from kombu.pools import producers
+
+        with producers[self._connection].acquire(block=True, timeout=5) as producer:
+            producer.publish(
+                event, exchange=self.exchange, serializer="json", declare=[self.exchange],
+                retry=True, retry_policy={"max_retries": 2, "interval_start": 0.2},
+            )
+
+    def attach(self, hub):
+        self.hub = hub
+        threading.Thread(target=self._consume, name="job-events", daemon=True).start()
+
+    def _consume(self):
+        from kombu import Connection, Queue
+
+        queue = Queue(
+            f"{JOB_EVENTS_EXCHANGE}.{uuid.uuid4().hex}", exchange=self.exchange,
+            exclusive=True, auto_delete=True, durable=False,
+        )
+        while True:
+            try:
+                with Connection(self.url) as connection:
+                    with connection.Consumer(queue, callbacks=[self._on_message], accept=["json"], no_ack=True):
+                        logger.info("📡 Subscribed to job events", extra={"exchange": JOB_EVENTS_EXCHANGE})
+                        while True:
+                            try:
+                                connection.drain_events(timeout=1)
+                            except socket.timeout:
+                                pass
+            except Exception as e:
+                logger.warning(f"⚠️ Job event consumer disconnected: {e}. Reconnecting in 5s")
+                time.sleep(5)
+
+    def _on_message(self, body, message):
+        self.hub.dispatch(body)
+
+
+_bus = None
+_hub = None
+_lock = threading.Lock()
+
+
+def get_event_bus():
+    global _bus
+    if _bus is None:
+        with _lock:
+            if _bus is None:
+                if JOB_EVENTS_BACKEND == "broker" and JOB_EVENTS_URL:
+                    _bus = BrokerEventBus(JOB_EVENTS_URL)
+                else:
+                    _bus = MemoryEventBus()
+    return _bus
+
+
+def get_job_event_hub():
+    """
+    프로세스당 하나의 허브를 처음 사용할 때 생성하고 이벤트 수신을 시작
+    """
+    global _hub
+    if _hub is None:
+        bus = get_event_bus()
+        with _lock:
+            if _hub is None:
+                hub = JobEventHub()
+                bus.attach(hub)
+                _hub = hub
+    return _hub
+
+
+def publish_job_event(task_id, stage, **data):
+    """
+    작업 진행 이벤트 발행, 전달에 실패해도 작업은 계속 진행한다.
+    """
+    if task_id is None:
+        return
+    event = {"task_id": task_id, "stage": stage, "ts": round(time.time(), 3), **data}
+    try:
+        get_event_bus().publish(event)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to publish job event {stage}: {e}", extra={"task_id": task_id})
+
+
+def task_result_event(task_id):
+    """
+    Celery 결과 저장소에 기록된 작업 종료 상태를 done/failed 이벤트로 변환 (종료 전이거나 알 수 없으면 None)
+    구독을 시작할 때 한 번 확인해, 이벤트 기록이 없거나(API 기동 전에 끝났거나 기록에서 밀려남) 종료 이벤트를 놓친 작업을 처리한다.
+    """
+    from celery.result import AsyncResult
+    from app.tasks.celery_app import app as celery_app
+
+    try:
+        result = AsyncResult(task_id, app=celery_app)
+        state = result.state
+        if state == "SUCCESS":
+            return {"task_id": task_id, "stage": "done", "ts": round(time.time(), 3), "text": result.result}
+        if state in ("FAILURE", "REVOKED"):
+            return {"task_id": task_id, "stage": "failed", "ts": round(time.time(), 3), "error": str(result.result)}
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to read task state: {e}", extra={"task_id": task_id})
+    return None
+
+
+class JobProgress:
+    """
+    전사 작업 하나의 진행 단계를 발행하는 헬퍼
+    started → chunk(세그먼트 k 전사 완료, 전체 수는 디코딩이 끝난 뒤 알 수 있음) → converted → done / failed
+    세그먼트 전사가 여러 스레드에서 끝나므로 완료 수 집계는 락으로 보호한다.
+    """
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+        self.total = None
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def publish(self, stage, **data):
+        publish_job_event(self.task_id, stage, **data)
+
+    def converted(self, segments, stats):
+        with self._lock:
+            self.total = segments
+            completed = self.completed
+        self.publish("converted", segments=segments, completed=completed, **stats)
+
+    def chunk_done(self, index, offset):
+        with self._lock:
+            self.completed += 1
+            completed, total = self.completed, self.total
+        self.publish("chunk", index=index, offset=offset, completed=completed, total=total)
+
+    def done(self, text):
+        self.publish("done", completed=self.completed, total=self.total, text=text)
+
+    def failed(self, error):
+        self.publish("failed", error=str(error))
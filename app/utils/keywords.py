@@ -0,0 +1,355 @@
+# /utils/keywords.py
+import os
+import re
+import logging
+from collections import Counter
+import numpy as np
+from sqlalchemy import select, delete, update, func, bindparam
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+from dotenv import load_dotenv
+
+from app.utils.database import SessionLocal
+from app.utils.models import Meeting, Conversation, Keyword, KeyTopic, TermStat, MeetingTerm, bump_meeting_version
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# 회의당 저장할 키워드/핵심 주제 수, 백필 시 한 번에 처리할 회의 수
+KEYWORD_COUNT = int(os.getenv("KEYWORD_COUNT", "10"))
+KEY_TOPIC_COUNT = int(os.getenv("KEY_TOPIC_COUNT", "5"))
+KEYWORD_BATCH_SIZE = int(os.getenv("KEYWORD_BATCH_SIZE", "200"))
+# IN 조건 하나에 넣는 최대 단어 수
+TERM_QUERY_CHUNK = 1000
+# 키워드 요약(대표 발화) 최대 길이
+SUMMARY_MAX_LENGTH = 200
+
+TOKEN_PATTERN = re.compile(r"[가-힣]{2,}|[A-Za-z][A-Za-z0-9]+")
+# 명사 뒤에 붙는 조사 (긴 것부터 제거)
+JOSA = sorted(
+    ["으로써", "으로서", "에서는", "에게서", "이라고", "이라는", "까지", "부터", "에서", "에게", "한테",
+     "으로", "라고", "이나", "이랑", "하고", "처럼", "보다", "은", "는", "이", "가", "을", "를",
+     "에", "의", "와", "과", "도", "로", "만", "요"],
+    key=len, reverse=True,
+)
+# 서술어 어미로 끝나는 토큰은 키워드 후보에서 제외
+PREDICATE_ENDING = re.compile(r"(니다|어요|아요|해요|네요|죠|는데|지만|면서|거든요|었다|했다|한다)$")
+STOPWORDS = {
+    "그리고", "그런데", "그래서", "하지만", "그러면", "그럼", "이제", "그냥", "정말", "진짜", "우리", "저희",
+    "이거", "그거", "저거", "이것", "그것", "저것", "여기", "거기", "지금", "아니", "있는", "하는", "없는",
+    "이런", "그런", "저런", "많이", "같은", "생각", "부분", "정도", "약간", "때문", "이번", "다음", "어떤",
+    "대해", "대해서", "대한", "관련", "통해",
+    "the", "and", "for", "that", "this", "with", "you", "are", "was", "have", "not", "but", "what",
+    "all", "can", "will", "just", "there", "they", "from", "about", "like", "yeah", "okay", "um", "uh",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text):
+    """
+    발화를 키워드 후보 단어 목록으로 변환 (영문 소문자화, 조사 제거, 불용어/서술어 제외)
+    형태소 분석기 없이 동작하는 경량 규칙 기반 토크나이저
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(text):
+        token = token.lower()
+        for josa in JOSA:
+            if token.endswith(josa) and len(token) - len(josa) >= 2:
+                token = token[:-len(josa)]
+                break
+        if token in STOPWORDS or PREDICATE_ENDING.search(token):
+            continue
+        terms.append(token)
+    return terms
+
+
+def count_terms(contents):
+    """
+    회의 발화 목록의 단어(unigram)와 인접 단어쌍(bigram, 핵심 주제 후보) 빈도
+    bigram은 "단어 단어" 형태로 저장되어 unigram과 같은 통계 테이블을 공유한다.
+    """
+    counts = Counter()
+    for content in contents:
+        terms = tokenize(content)
+        counts.update(terms)
+        counts.update(f"{a} {b}" for a, b in zip(terms, terms[1:]) if a != b)
+    return counts
+
+
+def load_documents(db, meeting_ids):
+    """
+    회의별 발화 목록을 한 번의 쿼리로 조회 ({meeting_id: [content, ...]})
+    """
+    documents = {meeting_id: [] for meeting_id in meeting_ids}
+    rows = db.execute(
+        select(Conversation.meeting_id, Conversation.content)
+        .where(Conversation.meeting_id.in_(meeting_ids))
+        .order_by(Conversation.meeting_id, Conversation.id)
+    )
+    for meeting_id, content in rows:
+        documents[meeting_id].append(content)
+    return documents
+
+
+def _chunks(items, size=TERM_QUERY_CHUNK):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _increment_terms(db, deltas):
+    """
+    term_stats.doc_count를 단어별 증감값만큼 일괄 갱신 (없는 단어는 추가)
+    동시에 실행되는 워커끼리 충돌하지 않도록 DB의 upsert 구문 사용
+    """
+    increments = [{"term": term, "doc_count": delta} for term, delta in deltas.items() if delta > 0]
+    decrements = [{"b_term": term, "delta": -delta} for term, delta in deltas.items() if delta < 0]
+
+    if increments:
+        dialect = db.bind.dialect.name
+        table = TermStat.__table__
+        if dialect == "mysql":
+            stmt = mysql.insert(table)
+            stmt = stmt.on_duplicate_key_update(doc_count=table.c.doc_count + stmt.inserted.doc_count)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.term], set_={"doc_count": table.c.doc_count + stmt.excluded.doc_count}
+            )
+        else:
+            stmt = None
+        for chunk in _chunks(increments):
+            if stmt is None:
+                _increment_terms_generic(db, chunk)
+            else:
+                db.execute(stmt, chunk)
+
+    if decrements:
+        stmt = (
+            update(TermStat.__table__)
+            .where(TermStat.term == bindparam("b_term"))
+            .values(doc_count=TermStat.doc_count - bindparam("delta"))
+        )
+        for chunk in _chunks(decrements):
+            db.execute(stmt, chunk)
+
+
+def _increment_terms_generic(db, increments):
+    """
+    upsert 구문이 없는 DB용: 있는 단어는 증가시키고 없는 단어는 추가
+    다른 워커가 같은 단어를 먼저 추가해 충돌하면 savepoint를 되돌리고 한 번 더 시도한다.
+    """
+    table = TermStat.__table__
+    for attempt in range(2):
+        try:
+            with db.begin_nested():
+                existing = set(db.scalars(
+                    select(table.c.term).where(table.c.term.in_([row["term"] for row in increments]))
+                ))
+                updates = [
+                    {"b_term": row["term"], "delta": row["doc_count"]} for row in increments if row["term"] in existing
+                ]
+                inserts = [row for row in increments if row["term"] not in existing]
+                if updates:
+                    db.execute(
+                        update(table)
+                        .where(table.c.term == bindparam("b_term"))
+                        .values(doc_count=table.c.doc_count + bindparam("delta")),
+                        updates,
+                    )
+                if inserts:
+                    db.execute(table.insert(), inserts)
+            return
+        except IntegrityError:
+            if attempt:
+                raise
+
+
+def update_term_stats(db, term_sets):
+    """
+    회의별 단어 집합({meeting_id: set(term)})을 기준으로 문서 빈도(DF)를 증분 갱신
+    이전에 집계된 단어 집합(meeting_terms)과 비교해 추가/제거된 단어만 반영하므로
+    회의 하나를 다시 처리해도 전체 말뭉치를 다시 계산하지 않는다. (커밋은 호출자가 수행)
+    """
+    previous = {meeting_id: set() for meeting_id in term_sets}
+    rows = db.execute(
+        select(MeetingTerm.meeting_id, MeetingTerm.term).where(MeetingTerm.meeting_id.in_(list(term_sets)))
+    )
+    for meeting_id, term in rows:
+        previous[meeting_id].add(term)
+
+    deltas = Counter()
+    added_rows = []
+    for meeting_id, terms in term_sets.items():
+        added = terms - previous[meeting_id]
+        removed = previous[meeting_id] - terms
+        deltas.update(added)
+        deltas.subtract(removed)
+        added_rows.extend({"meeting_id": meeting_id, "term": term} for term in added)
+        for chunk in _chunks(removed):
+            db.execute(
+                delete(MeetingTerm).where(MeetingTerm.meeting_id == meeting_id, MeetingTerm.term.in_(chunk))
+            )
+
+    _increment_terms(db, deltas)
+    for chunk in _chunks(added_rows):
+        db.execute(MeetingTerm.__table__.insert(), chunk)
+
+
+def load_doc_freq(db, terms):
+    doc_freq = {}
+    for chunk in _chunks(terms):
+        rows = db.execute(select(TermStat.term, TermStat.doc_count).where(TermStat.term.in_(chunk)))
+        doc_freq.update(rows.all())
+    return doc_freq
+
+
+def count_documents(db):
+    return db.execute(select(func.count(func.distinct(MeetingTerm.meeting_id)))).scalar() or 0
+
+
+def score_documents(counts, doc_freq, total_docs):
+    """
+    회의별 단어 빈도({meeting_id: Counter})에 대한 TF-IDF를 한 번에 계산하고
+    회의마다 점수 내림차순의 (단어 목록, 단어쌍 목록)을 반환
+
+    (회의, 단어, 빈도)를 COO 형식의 NumPy 배열로 펼쳐 벡터 연산으로 점수를 구한다.
+    tf = 1 + log(빈도), idf = log((1 + N) / (1 + df)) + 1
+    """
+    vocabulary = {}
+    rows, cols, values = [], [], []
+    meeting_ids = list(counts)
+    for row, meeting_id in enumerate(meeting_ids):
+        for term, count in counts[meeting_id].items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            values.append(count)
+    if not values:
+        return {meeting_id: ([], []) for meeting_id in meeting_ids}
+
+    terms = np.array(list(vocabulary), dtype=object)
+    rows = np.asarray(rows)
+    cols = np.asarray(cols)
+    values = np.asarray(values, dtype=np.float64)
+    df = np.array([max(1, doc_freq.get(term, 1)) for term in terms], dtype=np.float64)
+    idf = np.log((1 + total_docs) / (1 + df)) + 1
+    scores = (1 + np.log(values)) * idf[cols]
+    is_phrase = np.char.find(terms.astype(str), " ")[cols] >= 0
+
+    # 회의 순, 점수 내림차순으로 정렬한 뒤 회의별 구간을 잘라 상위 항목 선택
+    order = np.lexsort((-scores, rows))
+    bounds = np.searchsorted(rows[order], np.arange(len(meeting_ids) + 1))
+    results = {}
+    for row, meeting_id in enumerate(meeting_ids):
+        ranked = order[bounds[row]:bounds[row + 1]]
+        phrase = is_phrase[ranked]
+        # 한 번만 등장한 단어쌍은 우연한 인접일 가능성이 커서 핵심 주제에서 제외
+        repeated = values[ranked] > 1
+        keywords = terms[cols[ranked[~phrase][:KEYWORD_COUNT]]].tolist()
+        topics = terms[cols[ranked[phrase & repeated][:KEY_TOPIC_COUNT]]].tolist()
+        results[meeting_id] = (keywords, topics)
+    return results
+
+
+def representative_utterance(contents, keyword):
+    """
+    키워드가 처음 등장한 발화를 키워드 요약으로 사용
+    """
+    for content in contents:
+        if keyword in content.lower():
+            return content[:SUMMARY_MAX_LENGTH]
+    return None
+
+
+def write_keywords(db, documents, ranked):
+    """
+    회의별 키워드/핵심 주제를 기존 값(기본 키워드 포함)과 교체해 일괄 저장 (커밋은 호출자가 수행)
+    추출된 단어가 없는 회의는 건드리지 않는다.
+    """
+    meeting_ids = [meeting_id for meeting_id, (keywords, _) in ranked.items() if keywords]
+    if not meeting_ids:
+        return 0
+    keyword_rows = []
+    topic_rows = []
+    for meeting_id in meeting_ids:
+        keywords, topics = ranked[meeting_id]
+        keyword_rows.extend(
+            {"meeting_id": meeting_id, "keyword": keyword,
+             "summary": representative_utterance(documents[meeting_id], keyword)}
+            for keyword in keywords
+        )
+        topic_rows.extend({"meeting_id": meeting_id, "topic": topic} for topic in topics)
+
+    db.execute(delete(Keyword).where(Keyword.meeting_id.in_(meeting_ids)))
+    db.execute(delete(KeyTopic).where(KeyTopic.meeting_id.in_(meeting_ids)))
+    db.execute(Keyword.__table__.insert(), keyword_rows)
+    if topic_rows:
+        db.execute(KeyTopic.__table__.insert(), topic_rows)
+    db.execute(bump_meeting_version(*meeting_ids))
+    return len(meeting_ids)
+
+
+def extract_meeting_keywords(meeting_id):
+    """
+    회의 하나의 대화로 DF 통계를 증분 갱신한 뒤 TF-IDF 상위 키워드/핵심 주제를 저장
+    """
+    db = SessionLocal()
+    try:
+        documents = load_documents(db, [meeting_id])
+        counts = {meeting_id: count_terms(documents[meeting_id])}
+        update_term_stats(db, {meeting_id: set(counts[meeting_id])})
+        doc_freq = load_doc_freq(db, counts[meeting_id])
+        ranked = score_documents(counts, doc_freq, count_documents(db))
+        write_keywords(db, documents, ranked)
+        db.commit()
+        return ranked[meeting_id]
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _meeting_batches(db, meeting_ids, batch_size):
+    if meeting_ids is None:
+        meeting_ids = db.execute(select(Meeting.id).order_by(Meeting.id)).scalars().all()
+    for start in range(0, len(meeting_ids), batch_size):
+        yield meeting_ids[start:start + batch_size]
+
+
+def backfill_keywords(meeting_ids=None, batch_size=KEYWORD_BATCH_SIZE):
+    """
+    여러 회의(기본: 전체)의 키워드를 일괄 계산
+
+    1단계에서 batch_size개 회의씩 DF 통계를 갱신하고, 2단계에서 완성된 말뭉치 통계로
+    배치 단위 TF-IDF를 계산해 저장한다. 배치마다 커밋하므로 중간에 실패해도 처리한 배치는 유지되며,
+    같은 회의를 다시 처리해도 DF가 중복 집계되지 않는다.
+    """
+    db = SessionLocal()
+    try:
+        batches = list(_meeting_batches(db, meeting_ids, batch_size))
+        for batch in batches:
+            documents = load_documents(db, batch)
+            update_term_stats(db, {meeting_id: set(count_terms(contents)) for meeting_id, contents in documents.items()})
+            db.commit()
+        logger.info(f"📊 Term statistics updated for {sum(map(len, batches))} meeting(s)")
+
+        total_docs = count_documents(db)
+        written = 0
+        for batch in batches:
+            documents = load_documents(db, batch)
+            counts = {meeting_id: count_terms(contents) for meeting_id, contents in documents.items()}
+            doc_freq = load_doc_freq(db, set().union(*counts.values()))
+            written += write_keywords(db, documents, score_documents(counts, doc_freq, total_docs))
+            db.commit()
+        logger.info(f"🏷️ Keywords written for {written} meeting(s)")
+        return written
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
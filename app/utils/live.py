@@ -0,0 +1,95 @@
+# /utils/live.py
+import asyncio
+import logging
+
+from app.utils.audio import STT_SAMPLE_RATE, SAMPLE_WIDTH, ffmpeg_decode_command
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSegmenter:
+    """
+    수신 중인 WebM 스트림을 ffmpeg 파이프로 디코딩하고
+    segment_seconds 길이의 PCM 세그먼트가 완성될 때마다 on_segment(index, offset, pcm)를 호출
+    on_segment가 실패해도 디코딩은 계속하며, 실패한 세그먼트는 on_error(index, offset, error)로 알린다.
+    """
+
+    def __init__(self, on_segment, segment_seconds, on_error=None):
+        self.on_segment = on_segment
+        self.on_error = on_error
+        self.segment_bytes = int(segment_seconds * STT_SAMPLE_RATE) * SAMPLE_WIDTH
+        self.failed_segments = 0
+        self._process = None
+        self._reader_task = None
+        self._index = 0
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            *ffmpeg_decode_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader_task = asyncio.create_task(self._read_segments())
+
+    async def feed(self, data):
+        if self._reader_task.done():
+            # stdout을 읽는 쪽이 없으면 파이프가 차서 drain()이 영원히 막히므로 바로 실패시킴
+            raise RuntimeError("Live segment reader stopped")
+        self._process.stdin.write(data)
+        await self._process.stdin.drain()
+
+    async def _read_segments(self):
+        try:
+            pending = bytearray()
+            while True:
+                chunk = await self._process.stdout.read(64 * 1024)
+                if not chunk:
+                    break
+                pending += chunk
+                while len(pending) >= self.segment_bytes:
+                    await self._emit(bytes(pending[:self.segment_bytes]))
+                    del pending[:self.segment_bytes]
+            if pending:
+                await self._emit(bytes(pending))
+        except Exception:
+            # 읽기가 멈추면 ffmpeg도 종료해 feed()가 파이프에서 막히지 않게 함
+            self._kill()
+            raise
+
+    async def _emit(self, pcm):
+        index = self._index
+        offset = index * self.segment_bytes / SAMPLE_WIDTH / STT_SAMPLE_RATE
+        self._index += 1
+        try:
+            await self.on_segment(index, offset, pcm)
+        except Exception as e:
+            self.failed_segments += 1
+            logger.error(f"❌ Failed to dispatch live segment {index}: {e}", extra={"index": index})
+            if self.on_error:
+                await self.on_error(index, offset, e)
+
+    def _kill(self):
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+
+    async def finish(self):
+        """
+        입력을 닫고 남은 PCM을 마지막 세그먼트로 내보낸 뒤 ffmpeg 종료를 기다림
+        """
+        if not self._process.stdin.is_closing():
+            self._process.stdin.close()
+        await self._reader_task
+        await self._process.wait()
+
+    async def close(self):
+        """
+        finish() 없이 연결이 끝난 경우(오류 등) ffmpeg와 읽기 작업 정리
+        """
+        if self._reader_task is None:
+            return  # start()가 실패함 (ffmpeg 실행 불가 등)
+        self._kill()
+        if not self._reader_task.done():
+            self._reader_task.cancel()
+        await asyncio.gather(self._reader_task, return_exceptions=True)
+        await self._process.wait()
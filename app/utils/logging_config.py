@@ -0,0 +1,102 @@
+# /utils/logging_config.py
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+from dotenv import load_dotenv
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# 로그 레벨과 형식 (json: 한 줄 JSON 레코드, text: 사람이 읽기 쉬운 형식)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# LogRecord 기본 속성 (extra로 넘긴 필드만 골라내기 위해 사용)
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener = None
+_configured = False
+
+class JsonFormatter(logging.Formatter):
+    """
+    로그 레코드를 한 줄 JSON으로 출력, logger.info(..., extra={...})의 필드를 그대로 포함
+    """
+
+    def format(self, record):
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def setup_logging(level=None, queued=True):
+    """
+    루트 로거에 QueueHandler를 달고 실제 출력은 별도 스레드의 QueueListener가 담당
+    (요청 처리/오디오 수신 경로에서는 큐에 넣기만 하므로 I/O로 막히지 않음)
+    queued=False면 StreamHandler로 바로 출력한다. Celery prefork 워커처럼 설정 후 fork 되는 프로세스는
+    자식에 리스너 스레드가 복사되지 않아 큐에 쌓인 로그가 출력되지 않으므로 이 방식을 사용해야 한다.
+    여러 번 호출해도 한 번만 설정된다.
+    """
+    global _listener, _configured
+    if _configured:
+        return
+    _configured = True
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level or LOG_LEVEL)
+    if not queued:
+        root.addHandler(stream_handler)
+        return
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+class LogSampler:
+    """
+    초당 수십 번 호출되는 경로(프레임 수신 등)용 샘플러
+    sample()은 interval 초에 한 번만 직전 기록 이후 건너뛴 횟수(0일 수 있음)를 반환하고, 그 외에는 None을 반환한다.
+    (건너뛴 횟수가 0이어도 기록해야 하므로 `is not None`으로 확인)
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._last = 0.0
+        self._skipped = 0
+
+    def sample(self):
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            self._skipped += 1
+            return None
+        skipped, self._skipped = self._skipped, 0
+        self._last = now
+        return skipped
@@ -0,0 +1,146 @@
+# /utils/metrics.py
+import os
+import re
+import time
+from contextlib import contextmanager
+from prometheus_client import (
+    Counter, Gauge, Histogram, CollectorRegistry, REGISTRY, CONTENT_TYPE_LATEST,
+    generate_latest, start_http_server, multiprocess,
+)
+
+# Celery prefork 워커처럼 여러 프로세스의 지표를 합쳐야 할 때 설정 (prometheus_client 멀티프로세스 모드)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# 파이프라인 단계별 소요 시간 (minio_download, decode, stt_request, minio_upload, db_write)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "stt_pipeline_stage_seconds", "Time spent in each audio pipeline stage", ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+AUDIO_BYTES_INGESTED = Counter(
+    "stt_audio_bytes_ingested_total", "Audio bytes received over the WebSocket"
+)
+AUDIO_SECONDS_TRANSCRIBED = Counter(
+    "stt_audio_seconds_transcribed_total", "Seconds of audio sent to the STT API"
+)
+AUDIO_SECONDS_SKIPPED = Counter(
+    "stt_audio_seconds_skipped_total", "Seconds of silence skipped before STT"
+)
+STT_CACHE_REQUESTS = Counter(
+    "stt_cache_requests_total", "Transcription cache lookups", ["result"]
+)
+WEBSOCKET_SESSIONS = Gauge(
+    "stt_websocket_sessions_active", "Active audio WebSocket sessions", multiprocess_mode="livesum"
+)
+WEBSOCKET_SESSIONS_TOTAL = Counter(
+    "stt_websocket_sessions_total", "Audio WebSocket sessions opened"
+)
+STT_REQUESTS_IN_FLIGHT = Gauge(
+    "stt_requests_in_flight", "STT API requests in flight", multiprocess_mode="livesum"
+)
+TASKS_IN_FLIGHT = Gauge(
+    "stt_tasks_in_flight", "Celery tasks currently running", ["task"], multiprocess_mode="livesum"
+)
+TASK_QUEUE_WAIT_SECONDS = Histogram(
+    "stt_task_queue_wait_seconds", "Time a Celery task waited in its queue before starting", ["queue"],
+    buckets=STAGE_BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"],
+)
+
+
+@contextmanager
+def track_stage(stage):
+    """
+    with 블록의 소요 시간을 해당 파이프라인 단계 히스토그램에 기록
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PIPELINE_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def track_iter(iterable, stage):
+    """
+    iterable이 다음 항목을 만들어 내는 데 걸린 시간(예: ffmpeg 디코딩)을 합산해 단계 히스토그램에 기록
+    """
+    total = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                total += time.perf_counter() - start
+            yield item
+    finally:
+        PIPELINE_STAGE_SECONDS.labels(stage).observe(total)
+
+
+def record_audio_seconds(stats):
+    """
+    VAD 분할 결과(stats)의 전사/건너뛴 오디오 길이를 카운터에 반영
+    """
+    skipped = stats.get("skipped_seconds", 0.0)
+    AUDIO_SECONDS_SKIPPED.inc(skipped)
+    AUDIO_SECONDS_TRANSCRIBED.inc(max(0.0, stats.get("total_seconds", 0.0) - skipped))
+
+
+_PATH_PARAM = re.compile(r"{(\w+)(?::\w+)?}")
+
+
+def route_template(scope):
+    """
+    요청이 매칭된 라우트의 경로 템플릿 (예: /meetings/{meeting_id})
+    실제 ID를 라벨로 쓰지 않아 시계열 수가 라우트 수로 제한된다.
+    FastAPI 버전에 따라 route.path에 include_router 접두사가 빠져 있으면 실제 경로에서 복원한다.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    params = scope.get("path_params", {})
+    rendered = _PATH_PARAM.sub(lambda m: str(params.get(m.group(1), m.group(0))), route.path)
+    path = scope.get("path", "")
+    if path != rendered and path.endswith(rendered):
+        return path[:-len(rendered)] + route.path
+    return route.path
+
+
+def observe_http_request(method, route, status, seconds):
+    HTTP_REQUEST_SECONDS.labels(method, route, str(status)).observe(seconds)
+
+
+def metrics_registry():
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics():
+    """
+    Prometheus 텍스트 형식의 지표와 Content-Type
+    """
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """
+    멀티프로세스 모드에서 종료된 프로세스의 livesum 게이지 값을 합계에서 제외
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+
+def start_metrics_server(port):
+    """
+    FastAPI가 없는 프로세스(Celery 워커)에서 /metrics를 제공하는 HTTP 서버 시작
+    """
+    start_http_server(port, registry=metrics_registry())
@@ -1,34 +1,115 @@
 # /utils/models.py
-from sqlalchemy.ext.automap import automap_base
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, update
 from sqlalchemy.orm import relationship
-from sqlalchemy import create_engine, MetaData
-import os
-from dotenv import load_dotenv
 
-# Docker 환경인지 확인
-IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+from app.utils.database import Base
 
-if not IS_DOCKER:
-    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+# 기존 스키마와 동일한 테이블을 선언적으로 정의
+# (import 시 DB에 접속해 reflect 하지 않으므로 프로세스 기동이 DB 상태와 무관함)
 
-# Read DATABASE_URL from .env file
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Create database engine
-engine = create_engine(DATABASE_URL, echo=True)
-Base = automap_base()
+class User(Base):
+    __tablename__ = "users"
 
-# Reflect the tables
-metadata = MetaData()
-metadata.reflect(engine, only=['users', 'conversations', 'key_topics', 'keywords', 'meetings', 'topic_details', 'topics'])
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    username = Column(String(255), unique=True, nullable=False)
+    userid = Column(String(255), unique=True, nullable=False)
+    hashed_password = Column(String(255), nullable=False)
 
-Base.prepare(engine, reflect=True)
 
-# Automatically generated classes
-User = Base.classes.users
-Meeting = Base.classes.meetings
-Topic = Base.classes.topics
-TopicDetail = Base.classes.topic_details
-Keyword = Base.classes.keywords
-KeyTopic = Base.classes.key_topics
-Conversation = Base.classes.conversations
+class Meeting(Base):
+    __tablename__ = "meetings"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_name = Column(String(255), nullable=False)
+    # 달력 조회(기간 범위 쿼리)용 인덱스: ix_meetings_meeting_date
+    meeting_date = Column(DateTime, nullable=False, index=True)
+    audio_url = Column(String(255))
+    # 회의 페이지 데이터(대화, 키워드 등)가 바뀔 때마다 1씩 증가 (GET /meetings/{id}/full의 ETag)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    topics = relationship("Topic", order_by="Topic.id")
+    keywords = relationship("Keyword", order_by="Keyword.id")
+    key_topics = relationship("KeyTopic", order_by="KeyTopic.id")
+    conversations = relationship("Conversation", order_by="Conversation.id")
+
+
+def bump_meeting_version(*meeting_ids):
+    """
+    회의 데이터를 바꾸는 트랜잭션에서 함께 실행할 meetings.version 증가 UPDATE 문
+    """
+    return update(Meeting).where(Meeting.id.in_(meeting_ids)).values(version=Meeting.version + 1)
+
+
+class Topic(Base):
+    __tablename__ = "topics"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    title = Column(String(255), nullable=False)
+
+    details = relationship("TopicDetail", order_by="TopicDetail.id")
+
+
+class TopicDetail(Base):
+    __tablename__ = "topic_details"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False)
+    detail = Column(Text)
+
+
+class Keyword(Base):
+    __tablename__ = "keywords"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    keyword = Column(String(255), nullable=False)
+    summary = Column(Text)
+
+
+class KeyTopic(Base):
+    __tablename__ = "key_topics"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    topic = Column(String(255), nullable=False)
+
+
+class Conversation(Base):
+    __tablename__ = "conversations"
+    # 회의록 전문 검색용 FULLTEXT 인덱스 (한국어는 공백 단위 토큰화가 맞지 않아 ngram 파서 사용)
+    __table_args__ = (
+        Index("ft_conversations_content", "content", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        # 녹음 재처리 시 해당 녹음에서 저장한 행만 교체하기 위한 인덱스
+        Index("ix_conversations_meeting_file", "meeting_id", "file_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    speaker = Column(String(255), nullable=False)
+    time_stamp = Column(String(255), nullable=False)
+    content = Column(Text, nullable=False)
+    color = Column(String(255))
+    # 전사로 저장된 행의 원본 녹음 id (직접 입력한 대화는 NULL)
+    file_id = Column(String(64))
+
+
+class TermStat(Base):
+    """
+    키워드 추출용 말뭉치 통계: 단어(또는 "단어 단어" 쌍)가 등장한 회의 수
+    """
+    __tablename__ = "term_stats"
+
+    term = Column(String(255), primary_key=True)
+    doc_count = Column(Integer, nullable=False, default=0)
+
+
+class MeetingTerm(Base):
+    """
+    회의별로 term_stats에 집계된 단어 집합 (재처리 시 증감분만 반영하기 위해 보관)
+    """
+    __tablename__ = "meeting_terms"
+
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), primary_key=True)
+    term = Column(String(255), primary_key=True)
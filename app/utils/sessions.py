@@ -0,0 +1,236 @@
+# /utils/sessions.py
+import os
+import json
+import time
+import uuid
+import struct
+import asyncio
+import logging
+from dotenv import load_dotenv
+
+from app.utils.ingest import SpoolWriter
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# 재개 가능한 녹음 세션 설정
+# 세션 스풀 파일 위치, 마지막 수신 후 세션을 유지하는 시간(초)
+AUDIO_SESSION_DIR = os.getenv("AUDIO_SESSION_DIR", "./recordings/sessions")
+AUDIO_SESSION_TTL = float(os.getenv("AUDIO_SESSION_TTL", "3600"))
+# 만료된 세션을 찾아 전사하는 주기 (초)
+AUDIO_SESSION_SWEEP_INTERVAL = float(os.getenv("AUDIO_SESSION_SWEEP_INTERVAL", "300"))
+# 이만큼 쌓이거나 이 시간이 지나면 fsync 후 ack (ack된 바이트는 서버가 죽어도 보존됨)
+AUDIO_SESSION_SYNC_BYTES = int(os.getenv("AUDIO_SESSION_SYNC_BYTES", str(256 * 1024)))
+AUDIO_SESSION_SYNC_INTERVAL = float(os.getenv("AUDIO_SESSION_SYNC_INTERVAL", "1.0"))
+
+# 청크 프레임 헤더: 순번(uint32), 녹음 시작 기준 바이트 오프셋(uint64), 빅엔디언
+CHUNK_HEADER = struct.Struct("!IQ")
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingSession:
+    """
+    재연결해도 이어서 받을 수 있는 녹음 세션
+
+    수신한 바이트는 세션 스풀 파일에 오프셋 순서대로만 이어 쓰며, 파일 크기가 곧 수신 위치다.
+    클라이언트는 ack된 위치 이후의 바이트만 보관하다가 재연결 시 그 위치부터 다시 보내면 된다.
+    세션 정보(meeting_id, 시작 시각)는 옆의 .json 파일에 보관한다.
+    """
+
+    def __init__(self, session_id, meta, buffer_size):
+        self.session_id = session_id
+        self.meta = meta
+        self.path = session_path(session_id)
+        self.writer = SpoolWriter(self.path, buffer_size)
+        self.acked_bytes = self.writer.total_bytes
+        self.last_seq = None
+        self._last_sync = time.monotonic()
+        self._closed = False
+
+    @property
+    def received_bytes(self):
+        return self.writer.total_bytes
+
+    @property
+    def meeting_id(self):
+        return self.meta.get("meeting_id")
+
+    @property
+    def recording_seconds(self):
+        return time.time() - self.meta["created_at"]
+
+    @classmethod
+    def create(cls, meeting_id, buffer_size):
+        os.makedirs(AUDIO_SESSION_DIR, exist_ok=True)
+        session_id = str(uuid.uuid4())
+        meta = {"meeting_id": meeting_id, "created_at": time.time()}
+        # 임시 파일에 쓴 뒤 교체해 반쯤 쓰인 메타 파일이 남지 않게 함
+        tmp_path = f"{meta_path(session_id)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path(session_id))
+        return cls(session_id, meta, buffer_size)
+
+    @classmethod
+    def load(cls, session_id, buffer_size):
+        """
+        기존 세션을 열어 반환 (없거나 만료되었으면 None)
+        """
+        if not session_exists(session_id):
+            return None
+        return cls(session_id, load_meta(session_id), buffer_size)
+
+    async def append(self, offset, payload):
+        """
+        offset 위치의 청크를 기록
+        이미 받은 구간은 버리고(재전송), 받은 위치보다 뒤의 청크는 기록하지 않고 False를 반환(누락 발생)
+        """
+        received = self.received_bytes
+        end = offset + len(payload)
+        if offset > received:
+            return False
+        if end > received:
+            await self.writer.write(payload[received - offset:])
+        return True
+
+    def should_sync(self):
+        pending = self.received_bytes - self.acked_bytes
+        if pending <= 0:
+            return False
+        return (pending >= AUDIO_SESSION_SYNC_BYTES
+                or time.monotonic() - self._last_sync >= AUDIO_SESSION_SYNC_INTERVAL)
+
+    async def sync(self):
+        self.acked_bytes = await self.writer.sync()
+        self._last_sync = time.monotonic()
+        return self.acked_bytes
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        await self.sync()
+        await self.writer.close()
+
+    def remove(self):
+        remove_session_files(self.session_id)
+
+
+def session_path(session_id):
+    return os.path.join(AUDIO_SESSION_DIR, f"{session_id}.webm")
+
+
+def meta_path(session_id):
+    return os.path.join(AUDIO_SESSION_DIR, f"{session_id}.json")
+
+
+def load_meta(session_id):
+    with open(meta_path(session_id)) as f:
+        return json.load(f)
+
+
+def last_activity(session_id):
+    times = [os.path.getmtime(p) for p in (session_path(session_id), meta_path(session_id)) if os.path.exists(p)]
+    return max(times, default=0.0)
+
+
+def is_expired(session_id):
+    return time.time() - last_activity(session_id) > AUDIO_SESSION_TTL
+
+
+def session_exists(session_id):
+    """
+    재연결 가능한 세션인지 확인 (스풀 파일을 열지 않고 메타 파일만 확인)
+    """
+    try:
+        uuid.UUID(session_id)  # 경로 조작 방지
+        load_meta(session_id)
+    except (ValueError, OSError):
+        return False
+    return not is_expired(session_id)
+
+
+def remove_session_files(session_id):
+    for path in (session_path(session_id), meta_path(session_id)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def expired_sessions(active=()):
+    """
+    TTL 동안 재연결이 없었던 세션 id 목록 (현재 연결 중인 세션 제외)
+    """
+    if not os.path.isdir(AUDIO_SESSION_DIR):
+        return []
+    expired = []
+    for name in os.listdir(AUDIO_SESSION_DIR):
+        session_id, ext = os.path.splitext(name)
+        if ext == ".json" and session_id not in active and is_expired(session_id):
+            expired.append(session_id)
+    return expired
+
+
+class SessionRegistry:
+    """
+    이 프로세스에서 세션별로 하나의 연결만 기록하도록 관리
+    같은 세션으로 새 연결이 들어오면 이전 연결(끊긴 줄 모르고 남아 있는 연결 등)을 닫고 넘겨받는다.
+    세션별 락은 잡고 있거나 기다리는 연결이 하나라도 있는 동안 유지한다 (참조 수로 관리).
+    """
+
+    def __init__(self):
+        # session_id -> {"lock", "refs"(보유+대기 연결 수), "latest"(가장 최근에 들어온 연결)}
+        self._entries = {}
+        self._connections = {}
+
+    def is_active(self, session_id):
+        return session_id in self._connections
+
+    async def acquire(self, session_id, websocket, timeout):
+        """
+        세션의 기록 권한을 얻으면 True, 기다리는 동안 더 새로운 연결이 들어와 밀려났으면 False
+        """
+        entry = self._entries.setdefault(session_id, {"lock": asyncio.Lock(), "refs": 0, "latest": None})
+        entry["refs"] += 1
+        entry["latest"] = websocket
+        previous = self._connections.get(session_id)
+        if previous is not None:
+            try:
+                await previous.close(code=4000, reason="Session resumed on another connection")
+            except Exception:
+                pass
+        try:
+            await asyncio.wait_for(entry["lock"].acquire(), timeout)
+        except BaseException:
+            self._unref(session_id, entry)
+            raise
+        if entry["latest"] is not websocket:
+            # 기다리는 동안 같은 세션의 더 새로운 연결이 들어옴: 그 연결에 넘겨줌
+            entry["lock"].release()
+            self._unref(session_id, entry)
+            return False
+        self._connections[session_id] = websocket
+        return True
+
+    def release(self, session_id, websocket):
+        """
+        acquire가 True를 반환한 연결만 호출
+        """
+        if self._connections.get(session_id) is websocket:
+            del self._connections[session_id]
+        entry = self._entries[session_id]
+        entry["lock"].release()
+        self._unref(session_id, entry)
+
+    def _unref(self, session_id, entry):
+        entry["refs"] -= 1
+        if entry["refs"] == 0:
+            del self._entries[session_id]
+
+    def active(self):
+        return set(self._connections)
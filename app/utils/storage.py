@@ -0,0 +1,71 @@
+# /utils/storage.py
+import os
+import threading
+from contextlib import contextmanager
+from minio import Minio
+from dotenv import load_dotenv
+
+from app.utils.metrics import track_stage
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# MinIO 설정
+MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "")
+MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
+MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
+MINIO_BUCKET_NAME = os.getenv("MINIO_BUCKET_NAME")
+
+_minio_client = None
+_minio_lock = threading.Lock()
+
+
+def get_minio_client():
+    """
+    MinIO 클라이언트를 처음 사용할 때 생성하고 버킷 존재를 확인
+    (import 시점에는 네트워크 호출을 하지 않아 MinIO가 잠시 내려가 있어도 프로세스가 기동됨)
+    """
+    global _minio_client
+    if _minio_client is None:
+        with _minio_lock:
+            if _minio_client is None:
+                client = Minio(
+                    MINIO_ENDPOINT.replace("http://", "").replace("https://", ""),  # 프로토콜 제거
+                    access_key=MINIO_ACCESS_KEY,
+                    secret_key=MINIO_SECRET_KEY,
+                    secure=False
+                )
+                # MinIO 버킷 존재 확인 및 생성
+                if not client.bucket_exists(MINIO_BUCKET_NAME):
+                    client.make_bucket(MINIO_BUCKET_NAME)
+                _minio_client = client
+    return _minio_client
+
+
+@contextmanager
+def open_object(object_name, bucket_name=None, offset=0, length=0):
+    """
+    MinIO 객체를 스트림으로 열어 반환 (로컬 파일로 내려받지 않음)
+    offset/length를 주면 해당 바이트 구간만 요청한다 (length 0은 끝까지).
+    블록을 벗어나면 예외 여부와 관계없이 응답을 닫고 커넥션을 풀에 반환한다.
+    """
+    with track_stage("minio_download"):  # 첫 바이트까지의 시간 (본문은 읽는 쪽에서 스트리밍)
+        response = get_minio_client().get_object(
+            bucket_name or MINIO_BUCKET_NAME, object_name, offset=offset, length=length
+        )
+    try:
+        yield response
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def iter_object(object_name, offset=0, length=0, chunk_size=64 * 1024, bucket_name=None):
+    """
+    MinIO 객체(또는 바이트 구간)를 chunk_size 단위로 반환하는 generator (HTTP 스트리밍 응답용)
+    """
+    with open_object(object_name, bucket_name, offset, length) as response:
+        yield from response.stream(chunk_size)
@@ -0,0 +1,172 @@
+# /utils/stt.py
+import os
+import time
+import logging
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from app.utils.stt_cache import cached_transcribe
+from app.utils.metrics import track_stage, STT_REQUESTS_IN_FLIGHT
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# STT 엔드포인트 설정 (부하 테스트 시 로컬 스텁 서버 주소로 변경 가능)
+STT_API_BASE = os.getenv("STT_API_BASE", "https://api.openai.com/v1").rstrip("/")
+STT_API_KEY = os.getenv("OPENAI_API_KEY")
+STT_MODEL = os.getenv("STT_MODEL", "whisper-1")
+# 프로세스당 동시 요청 상한, 요청 타임아웃(초), 재시도 횟수, 백오프 기본/최대 대기 시간(초)
+STT_MAX_IN_FLIGHT = int(os.getenv("STT_MAX_IN_FLIGHT", "8"))
+STT_TIMEOUT = float(os.getenv("STT_TIMEOUT", "120"))
+STT_MAX_RETRIES = int(os.getenv("STT_MAX_RETRIES", "6"))
+STT_BACKOFF_BASE = float(os.getenv("STT_BACKOFF_BASE", "1.0"))
+STT_BACKOFF_MAX = float(os.getenv("STT_BACKOFF_MAX", "60"))
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# 재시도 대상 중 서버 과부하를 뜻하는 응답만 동시 요청 수를 줄임 (408/409는 재시도만 함)
+THROTTLE_STATUS = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+
+class STTError(Exception):
+    pass
+
+
+class AdaptiveLimiter:
+    """
+    동시 요청 수를 제한하는 AIMD 리미터
+    429/5xx를 받으면 허용 동시 수를 절반으로 줄이고, 성공할 때마다 1씩 늘려 max_limit까지 회복
+    """
+
+    def __init__(self, max_limit):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+            elif self.limit < self.max_limit:
+                self.limit += 1
+            self._cond.notify_all()
+
+
+class STTClient:
+    """
+    Whisper 호환 전사 API 클라이언트
+    커넥션 풀을 재사용하고, 동시 요청 수를 제한하며, 429/5xx/타임아웃 시 백오프 후 재시도한다.
+    """
+
+    def __init__(self, api_base=STT_API_BASE, api_key=STT_API_KEY, max_in_flight=STT_MAX_IN_FLIGHT,
+                 timeout=STT_TIMEOUT, max_retries=STT_MAX_RETRIES):
+        self.url = f"{api_base}/audio/transcriptions"
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = AdaptiveLimiter(max_in_flight)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_in_flight))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _request(self, audio_data, file_name, model):
+        self.limiter.acquire()
+        throttled = False
+        try:
+            with track_stage("stt_request"), STT_REQUESTS_IN_FLIGHT.track_inprogress():
+                response = self.session.post(
+                    self.url,
+                    files={"file": (file_name, audio_data, "audio/wav")},
+                    data={"model": model},
+                    timeout=self.timeout,
+                )
+            throttled = response.status_code in THROTTLE_STATUS
+            return response
+        except requests.RequestException:
+            throttled = True
+            raise
+        finally:
+            self.limiter.release(throttled)
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), STT_BACKOFF_MAX)
+            except ValueError:
+                pass
+        delay = min(STT_BACKOFF_BASE * (2 ** attempt), STT_BACKOFF_MAX)
+        return delay * (0.5 + random.random() / 2)  # 동시에 재시도가 몰리지 않도록 지터 적용
+
+    def transcribe_uncached(self, audio_data, file_name, model=STT_MODEL):
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self._request(audio_data, file_name, model)
+            except requests.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.ok:
+                    # 프록시/게이트웨이가 200으로 HTML 등을 돌려주는 경우도 일시적 오류로 보고 재시도
+                    try:
+                        body = response.json()
+                    except ValueError:
+                        body = None
+                    if isinstance(body, dict):
+                        return body.get("text", "")
+                    error = f"Invalid response body: {response.text[:200]}"
+                elif response.status_code not in RETRYABLE_STATUS:
+                    raise STTError(f"STT request failed ({response.status_code}): {response.text[:200]}")
+                else:
+                    error = f"HTTP {response.status_code}"
+
+            if attempt == self.max_retries:
+                raise STTError(f"STT request failed after {attempt + 1} attempts: {error}")
+            delay = self._backoff(attempt, response)
+            logger.warning(f"⚠️ STT {file_name} attempt {attempt + 1} failed ({error}). Retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def transcribe(self, audio_data, file_name, model=STT_MODEL):
+        """
+        WAV 세그먼트 바이트를 텍스트로 변환 (전사 캐시 적용)
+        """
+        return cached_transcribe(
+            audio_data, model, lambda: self.transcribe_uncached(audio_data, file_name, model)
+        )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_stt_client():
+    """
+    프로세스당 하나의 STT 클라이언트를 처음 사용할 때 생성
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = STTClient()
+    return _client
+
+
+def transcribe(audio_data, file_name, model=STT_MODEL):
+    return get_stt_client().transcribe(audio_data, file_name, model)
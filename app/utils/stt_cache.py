@@ -0,0 +1,241 @@
+# /utils/stt_cache.py
+import os
+import time
+import logging
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+from app.utils.metrics import STT_CACHE_REQUESTS
+
+# Docker 환경인지 확인
+IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
+
+if not IS_DOCKER:
+    load_dotenv()  # 로컬 개발 환경에서는 .env 파일 로드
+
+# 전사 캐시 설정
+# memory: 프로세스 내 LRU, disk: 로컬 디렉토리, redis: 공유 저장소, none: 사용 안 함
+STT_CACHE_BACKEND = os.getenv("STT_CACHE_BACKEND", "memory").lower()
+STT_CACHE_MAX_ENTRIES = int(os.getenv("STT_CACHE_MAX_ENTRIES", "10000"))
+STT_CACHE_MAX_BYTES = int(os.getenv("STT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+STT_CACHE_TTL = int(os.getenv("STT_CACHE_TTL", str(7 * 24 * 3600)))
+STT_CACHE_DIR = os.getenv("STT_CACHE_DIR", "./recordings/.stt_cache")
+STT_CACHE_URL = os.getenv("STT_CACHE_URL", "redis://localhost:6379/0")
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(audio_data, model):
+    """
+    정규화된 세그먼트 바이트(16kHz mono WAV)와 모델 이름으로 캐시 키 생성
+    """
+    digest = hashlib.sha256(audio_data).hexdigest()
+    return f"{model}:{digest}"
+
+
+class MemoryCache:
+    """
+    프로세스 내 LRU 캐시 (항목 수, 텍스트 총 크기, 수명 기준으로 제거)
+    """
+
+    def __init__(self, max_entries, max_bytes, ttl):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            text, stored_at = entry
+            if time.time() - stored_at > self.ttl:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def set(self, key, text):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (text, time.time())
+            self._size += len(text.encode())
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        text, _ = self._entries.pop(key)
+        self._size -= len(text.encode())
+
+
+class DiskCache:
+    """
+    로컬 디렉토리 캐시 (키별 텍스트 파일, 수정 시각 기준으로 오래된 항목부터 제거)
+    """
+
+    def __init__(self, directory, max_bytes, ttl):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key.replace(":", "_") + ".txt")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # LRU 순서 갱신
+            return text
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, text):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        # 디렉토리 전체를 훑는 정리는 일정 횟수의 쓰기마다 한 번만 수행
+        self._writes += 1
+        if self._writes % 100 == 1:
+            self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            now = time.time()
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".txt"):
+                    continue
+                stat = entry.stat()
+                if now - stat.st_mtime > self.ttl:
+                    os.remove(entry.path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+
+
+class RedisCache:
+    """
+    여러 API/워커 프로세스가 공유하는 Redis 캐시 (수명은 Redis TTL, 크기는 Redis maxmemory 정책으로 관리)
+    """
+
+    def __init__(self, url, ttl):
+        import redis  # 공유 캐시를 사용할 때만 필요
+
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self._client.get(f"stt:{key}")
+        return value.decode() if value is not None else None
+
+    def set(self, key, text):
+        self._client.set(f"stt:{key}", text.encode(), ex=self.ttl)
+
+
+class NullCache:
+    """
+    캐시 백엔드를 만들 수 없을 때(패키지 누락, 접속 설정 오류 등) 대신 사용하는 빈 캐시
+    """
+
+    def get(self, key):
+        return None
+
+    def set(self, key, text):
+        pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    STT_CACHE_BACKEND에 맞는 캐시 백엔드를 처음 사용할 때 생성
+    """
+    global _cache
+    if _cache is None and STT_CACHE_BACKEND != "none":
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    if STT_CACHE_BACKEND == "disk":
+                        _cache = DiskCache(STT_CACHE_DIR, STT_CACHE_MAX_BYTES, STT_CACHE_TTL)
+                    elif STT_CACHE_BACKEND == "redis":
+                        _cache = RedisCache(STT_CACHE_URL, STT_CACHE_TTL)
+                    else:
+                        _cache = MemoryCache(STT_CACHE_MAX_ENTRIES, STT_CACHE_MAX_BYTES, STT_CACHE_TTL)
+                except Exception as e:
+                    # 캐시를 만들 수 없어도 전사는 캐시 없이 계속 진행
+                    logger.warning(f"⚠️ STT cache backend '{STT_CACHE_BACKEND}' unavailable, caching disabled: {e}")
+                    _cache = NullCache()
+    return _cache
+
+
+def cached_transcribe(audio_data, model, transcribe):
+    """
+    캐시에 같은 세그먼트의 전사 결과가 있으면 반환하고, 없으면 transcribe()를 호출해 저장
+    실패한 호출은 캐시하지 않는다.
+    """
+    cache = get_cache()
+    if cache is None or isinstance(cache, NullCache):
+        return transcribe()
+
+    key = cache_key(audio_data, model)
+    try:
+        text = cache.get(key)
+    except Exception as e:
+        logger.warning(f"⚠️ STT cache lookup failed: {e}")
+        text = None
+
+    with _stats_lock:
+        _stats["hits" if text is not None else "misses"] += 1
+    STT_CACHE_REQUESTS.labels("hit" if text is not None else "miss").inc()
+    if text is not None:
+        return text
+
+    text = transcribe()
+    try:
+        cache.set(key, text)
+    except Exception as e:
+        logger.warning(f"⚠️ STT cache store failed: {e}")
+    return text
+
+
+def cache_stats():
+    """
+    현재 프로세스의 캐시 적중/미스 횟수와 적중률
+    """
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "backend": STT_CACHE_BACKEND,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
@@ -1,4 +1,8 @@
 # /utils/verification.py
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
@@ -17,6 +21,70 @@ if not IS_DOCKER:
 SECRET_KEY = os.getenv("JWT_SECRET")
 ALGORITHM = "HS256"
 
+# 검증된 토큰/사용자 캐시 설정 (항목 수 상한, 최대 보관 시간(초))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+
+
+class TTLCache:
+    """
+    항목 수가 제한된 LRU 캐시, 항목마다 만료 시각을 가짐
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    요청 간에 공유해도 안전한 사용자 정보 (세션에 묶인 ORM 객체 대신 캐시에 보관, 비밀번호 해시 제외)
+    """
+    id: int
+    username: str
+    userid: str
+
+
+# 토큰 -> 검증된 claims, userid -> CachedUser
+token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES)
+user_cache = TTLCache(USER_CACHE_MAX_ENTRIES)
+
 def create_access_token(payload: dict, expires_delta: timedelta = timedelta(hours=6)):
     expire = datetime.utcnow() + expires_delta
     payload.update(
@@ -34,10 +102,40 @@ def decode_access_token(token: str):
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
+def verify_access_token(token: str):
+    """
+    decode_access_token의 캐시 버전
+    검증에 성공한 토큰의 claims를 토큰의 exp와 TOKEN_CACHE_TTL 중 이른 시각까지 재사용
+    """
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
+    claims = decode_access_token(token)
+    expires_at = time.time() + TOKEN_CACHE_TTL
+    if "exp" in claims:
+        expires_at = min(expires_at, float(claims["exp"]))
+    token_cache.set(token, claims, expires_at)
+    return claims
+
+def get_cached_user(userid):
+    return user_cache.get(userid)
+
+def cache_user(userid, user):
+    """
+    ORM User 행에서 필요한 컬럼만 복사해 캐시하고 복사본을 반환
+    """
+    cached = CachedUser(id=user.id, username=user.username, userid=user.userid)
+    user_cache.set(userid, cached, time.time() + USER_CACHE_TTL)
+    return cached
+
+def auth_cache_stats():
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
 def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
-    payload = decode_access_token(token)
+    payload = verify_access_token(token)
 
     user_id = payload.get("user_id")
     if not user_id:
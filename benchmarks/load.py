@@ -0,0 +1,380 @@
+# /benchmarks/load.py
+"""
+부하/지연 벤치마크
+
+FastAPI 앱을 이 프로세스 안에서 uvicorn으로 띄우고, MinIO와 Whisper API는 로컬 대역
+(benchmarks/stubs.py)으로 바꿔 외부 서비스 없이 같은 조건으로 반복 측정한다.
+DB는 기본으로 임시 SQLite 파일을 쓰며 --database-url 로 로컬 MySQL을 지정할 수 있다.
+
+시나리오
+- ws:    N개 WebSocket 클라이언트가 합성 WebM을 실시간 속도로 /audio_recording/ws/audio 에 전송
+         (프로세스 내 Celery 워커가 제출된 작업을 처리, 종료 후 작업 완료까지의 지연도 측정)
+- rest:  /meetings/ 조회와 /users/login 혼합 요청
+- tasks: 긴 합성 녹음에 대해 Celery 작업을 eager 모드로 실행
+- all:   위 세 가지를 순서대로 실행
+
+각 시나리오는 처리량, p50/p95/p99 지연 시간, 프로세스 최대 RSS를 출력한다.
+서버와 클라이언트가 같은 프로세스이므로 RSS는 둘을 합친 값이다.
+
+    python benchmarks/load.py all
+    python benchmarks/load.py ws --clients 50 --duration 120 --minio-latency 0.02
+    python benchmarks/load.py rest --concurrency 32 --requests 2000
+    python benchmarks/load.py tasks --recordings 3 --recording-minutes 30 --stt-latency 0.5
+    python benchmarks/load.py rest --database-url mysql+pymysql://user:pw@127.0.0.1:3306/stt
+
+필요 패키지: requirements.txt + benchmarks/requirements.txt, ffmpeg
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import asyncio
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stubs import FakeMinio, WhisperStub  # noqa: E402
+
+BENCH_USER = {"username": "bench", "userid": "bench", "password": "bench-password"}
+
+
+# ---------------------------------------------------------------------------
+# 통계
+# ---------------------------------------------------------------------------
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def peak_rss_mb():
+    # Linux ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def report(name, samples, elapsed, unit="req", extra=""):
+    throughput = len(samples) / elapsed if elapsed else 0.0
+    if not samples:
+        print(f"  {name:<22} no samples")
+        return
+    print(
+        f"  {name:<22} n={len(samples):<6} {throughput:8.1f} {unit}/s  "
+        f"p50 {percentile(samples, 50) * 1000:8.1f}ms  p95 {percentile(samples, 95) * 1000:8.1f}ms  "
+        f"p99 {percentile(samples, 99) * 1000:8.1f}ms  max {max(samples) * 1000:8.1f}ms{extra}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# 환경 준비
+# ---------------------------------------------------------------------------
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def synthetic_webm(path, seconds):
+    """
+    5초 톤 + 3초 무음이 반복되는 Opus/WebM 녹음 생성 (VAD가 실제로 구간을 나누도록)
+    """
+    if os.path.exists(path):
+        return path
+    source = f"aevalsrc=0.3*sin(2*PI*440*t)*lt(mod(t\\,8)\\,5):s=48000:d={seconds}"
+    subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", "-f", "lavfi", "-i", source,
+         "-c:a", "libopus", "-b:a", "32k", "-f", "webm", path],
+        check=True,
+    )
+    return path
+
+
+def configure_environment(args, workdir):
+    """
+    앱 모듈을 import 하기 전에 설정을 환경 변수로 지정
+    """
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.update({
+        "IS_DOCKER": "true",
+        "DATABASE_URL": database_url,
+        "JWT_SECRET": "bench",
+        "MINIO_BUCKET_NAME": "bench",
+        "OPENAI_API_KEY": "bench",
+        "STT_CACHE_BACKEND": "none",  # 같은 합성 세그먼트가 캐시 적중으로 빠지지 않도록
+        "STT_BACKOFF_BASE": "0.1",
+        "JOB_EVENTS_BACKEND": "memory",  # 워커가 같은 프로세스에서 실행됨
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+        "LOG_FORMAT": "text",
+    })
+    # 수신 스풀 파일(./recordings)이 저장소가 아닌 임시 디렉토리에 생기도록
+    os.chdir(workdir)
+
+
+def setup_celery(eager):
+    """
+    서비스의 Celery 앱(큐/라우팅 설정 포함)을 브로커/결과 저장소만 프로세스 메모리로 바꿔 사용
+    """
+    from app.tasks.celery_app import app
+
+    app.conf.update(
+        broker_url="memory://", result_backend="cache+memory://",
+        task_always_eager=eager, task_eager_propagates=True, result_expires=None,
+    )
+    app.set_current()
+    app.set_default()
+    return app
+
+
+def setup_database():
+    from app.utils.auth import get_password_hash
+    from app.utils.database import Base, engine, SessionLocal
+    from app.utils.models import User, Meeting
+    from datetime import datetime
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.userid == BENCH_USER["userid"]).first() is None:
+            db.add(User(
+                username=BENCH_USER["username"], userid=BENCH_USER["userid"],
+                hashed_password=get_password_hash(BENCH_USER["password"]),
+            ))
+        meeting = Meeting(meeting_name="bench", meeting_date=datetime.now())
+        db.add(meeting)
+        db.commit()
+        return meeting.id
+    finally:
+        db.close()
+
+
+def start_server(app, port):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+# ---------------------------------------------------------------------------
+# 시나리오
+# ---------------------------------------------------------------------------
+
+async def stream_client(url, webm, duration, chunk_seconds, results):
+    import websockets
+
+    chunk_size = max(1, int(len(webm) * chunk_seconds / duration))
+    start = time.perf_counter()
+    async with websockets.connect(url, max_size=None) as ws:
+        connected = time.perf_counter()
+        results["connect"].append(connected - start)
+        for i, offset in enumerate(range(0, len(webm), chunk_size)):
+            # i번째 청크는 연결 후 i * chunk_seconds 시점에 전송 (실시간 속도)
+            delay = connected + i * chunk_seconds - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                results["send_lag"].append(-delay)
+            await ws.send(webm[offset:offset + chunk_size])
+        finished = time.perf_counter()
+        await ws.send(b"")
+        reply = await ws.recv()
+        results["finalize"].append(time.perf_counter() - finished)
+        results["bytes"] += len(webm)
+    if isinstance(reply, str) and reply.startswith("Task submitted: "):
+        results["tasks"].append((reply.split(": ", 1)[1], finished))
+
+
+def run_ws(args, base_url, workdir, celery_app, meeting_id):
+    from celery.contrib.testing.worker import start_worker
+
+    webm_path = synthetic_webm(os.path.join(workdir, f"stream_{args.duration}s.webm"), args.duration)
+    with open(webm_path, "rb") as f:
+        webm = f.read()
+    url = f"{base_url.replace('http', 'ws', 1)}/audio_recording/ws/audio?meeting_id={meeting_id}"
+    results = {"connect": [], "send_lag": [], "finalize": [], "tasks": [], "bytes": 0}
+
+    async def drive():
+        await asyncio.gather(*[
+            stream_client(url, webm, args.duration, args.chunk_seconds, results)
+            for _ in range(args.clients)
+        ])
+
+    print(f"▶ ws: {args.clients} clients x {args.duration}s WebM ({len(webm)} bytes) at real-time rate")
+    from app.tasks.celery_app import LIVE_QUEUE, BULK_QUEUE
+
+    with start_worker(celery_app, concurrency=args.worker_concurrency, pool="threads",
+                      perform_ping_check=False, shutdown_timeout=60, queues=[LIVE_QUEUE, BULK_QUEUE]):
+        start = time.perf_counter()
+        asyncio.run(drive())
+        ingest_elapsed = time.perf_counter() - start
+
+        # 녹음 종료 시점부터 워커 전사 완료까지
+        task_latency = []
+        for task_id, finished in results["tasks"]:
+            celery_app.AsyncResult(task_id).get(timeout=args.task_timeout)
+            task_latency.append(time.perf_counter() - finished)
+        elapsed = time.perf_counter() - start
+
+    audio_seconds = args.clients * args.duration
+    report("connect", results["connect"], ingest_elapsed)
+    report("finalize (upload)", results["finalize"], ingest_elapsed)
+    report("end-to-end transcript", task_latency, elapsed, unit="task")
+    lag = results["send_lag"]
+    print(
+        f"  ingest {results['bytes'] / ingest_elapsed / 1024:.1f} KiB/s, "
+        f"{audio_seconds / elapsed:.1f} audio-s/s overall, "
+        f"late frames {len(lag)} (max {max(lag, default=0) * 1000:.1f}ms), peak RSS {peak_rss_mb():.1f} MiB"
+    )
+
+
+def run_rest(args, base_url):
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    login = {"userid": BENCH_USER["userid"], "password": BENCH_USER["password"]}
+    token = session.post(f"{base_url}/users/login", data=login).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    login_every = max(1, round(1 / args.login_ratio)) if args.login_ratio > 0 else 0
+    latencies = {"GET /meetings/": [], "POST /users/login": []}
+    statuses = {}
+    lock = threading.Lock()
+
+    def one(i):
+        is_login = login_every and i % login_every == 0
+        t = time.perf_counter()
+        if is_login:
+            response = session.post(f"{base_url}/users/login", data=login)
+        else:
+            response = session.get(f"{base_url}/meetings/", headers=headers, params={"limit": 100})
+        elapsed = time.perf_counter() - t
+        key = "POST /users/login" if is_login else "GET /meetings/"
+        with lock:
+            latencies[key].append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    print(f"▶ rest: {args.requests} requests, concurrency {args.concurrency}, login ratio {args.login_ratio}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    for name, samples in latencies.items():
+        report(name, samples, elapsed)
+    print(f"  status {json.dumps(statuses, sort_keys=True)}, peak RSS {peak_rss_mb():.1f} MiB")
+
+
+def run_tasks(args, workdir, meeting_id, whisper):
+    from app.utils.storage import get_minio_client, MINIO_BUCKET_NAME
+    from app.api.audio_recording import process_audio_task
+    from app.tasks.tasks import convert_and_transcribe
+
+    seconds = int(args.recording_minutes * 60)
+    webm_path = synthetic_webm(os.path.join(workdir, f"recording_{seconds}s.webm"), seconds)
+    client = get_minio_client()
+
+    task_funcs = [
+        ("process_audio_task", process_audio_task),
+        ("convert_and_transcribe", convert_and_transcribe),
+    ]
+
+    print(f"▶ tasks: {args.recordings} recordings x {args.recording_minutes} min, eager mode")
+    for name, task in task_funcs:
+        durations = []
+        requests_before = whisper.requests
+        start = time.perf_counter()
+        for _ in range(args.recordings):
+            file_id = str(uuid.uuid4())
+            client.fput_object(MINIO_BUCKET_NAME, f"{file_id}.webm", webm_path)
+            t = time.perf_counter()
+            task.apply(args=(file_id, meeting_id)).get()
+            durations.append(time.perf_counter() - t)
+        elapsed = time.perf_counter() - start
+        realtime = seconds * len(durations) / elapsed
+        report(name, durations, elapsed, unit="rec", extra=f"  {realtime:.1f}x real-time")
+        print(f"  STT requests {whisper.requests - requests_before}, peak RSS {peak_rss_mb():.1f} MiB")
+
+
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", choices=["ws", "rest", "tasks", "all"])
+    parser.add_argument("--database-url", help="기본: 임시 SQLite 파일")
+    parser.add_argument("--minio-latency", type=float, default=0.005, help="MinIO 대역 호출당 지연(초)")
+    parser.add_argument("--minio-bandwidth", type=int, default=0, help="MinIO 대역 초당 전송 바이트 (0: 무제한)")
+    parser.add_argument("--stt-latency", type=float, default=0.3, help="Whisper 대역 요청당 지연(초)")
+    parser.add_argument("--stt-per-second", type=float, default=0.02, help="오디오 1초당 추가 지연(초)")
+    parser.add_argument("--stt-error-rate", type=float, default=0.0, help="429 응답 비율")
+    # ws
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--duration", type=int, default=30, help="클라이언트당 녹음 길이(초)")
+    parser.add_argument("--chunk-seconds", type=float, default=0.25, help="MediaRecorder timeslice")
+    parser.add_argument("--worker-concurrency", type=int, default=4)
+    parser.add_argument("--task-timeout", type=float, default=600)
+    # rest
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--login-ratio", type=float, default=0.05)
+    # tasks
+    parser.add_argument("--recordings", type=int, default=2)
+    parser.add_argument("--recording-minutes", type=float, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="stt-bench-")
+    whisper = WhisperStub(args.stt_latency, args.stt_per_second, args.stt_error_rate).start()
+    os.environ["STT_API_BASE"] = whisper.url
+    configure_environment(args, workdir)
+    celery_app = setup_celery(eager=args.scenario == "tasks")
+
+    from app.utils import storage
+    storage._minio_client = FakeMinio(args.minio_latency, args.minio_bandwidth)
+    storage._minio_client.make_bucket(storage.MINIO_BUCKET_NAME)
+
+    from app.main import app
+
+    meeting_id = setup_database()
+    print(f"workdir {workdir}, database {os.environ['DATABASE_URL']}, whisper stub {whisper.url}")
+
+    scenarios = ["ws", "rest", "tasks"] if args.scenario == "all" else [args.scenario]
+    server = None
+    if "ws" in scenarios or "rest" in scenarios:
+        port = free_port()
+        server, thread = start_server(app, port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        if "ws" in scenarios:
+            run_ws(args, base_url, workdir, celery_app, meeting_id)
+        if "rest" in scenarios:
+            run_rest(args, base_url)
+        if "tasks" in scenarios:
+            celery_app.conf.task_always_eager = True
+            run_tasks(args, workdir, meeting_id, whisper)
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join(10)
+        whisper.stop()
+
+
+if __name__ == "__main__":
+    main()
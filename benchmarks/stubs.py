@@ -0,0 +1,175 @@
+# /benchmarks/stubs.py
+"""
+벤치마크용 로컬 대역 (MinIO, Whisper API)
+
+- FakeMinio: 앱이 사용하는 Minio 메서드만 구현한 프로세스 내 객체 저장소
+- WhisperStub: /audio/transcriptions 를 흉내 내는 로컬 HTTP 서버 (STT_API_BASE로 지정)
+
+두 대역 모두 호출당 고정 지연과 전송량 비례 지연을 줄 수 있어
+실제 네트워크 왕복이 있는 환경과 비슷한 조건에서 파이프라인을 측정할 수 있다.
+"""
+import io
+import json
+import hashlib
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Object:
+    """
+    Minio.get_object 응답(urllib3 HTTPResponse)과 같은 방식으로 읽을 수 있는 객체
+    """
+
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def read(self, amt=None):
+        return self._buffer.read(amt)
+
+    def stream(self, amt=64 * 1024):
+        while True:
+            chunk = self._buffer.read(amt)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class FakeMinio:
+    """
+    메모리에 객체를 보관하는 Minio 대역
+
+    latency: 호출당 지연(초), bandwidth: 초당 전송 바이트 (0이면 제한 없음)
+    """
+
+    def __init__(self, latency=0.0, bandwidth=0):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.buckets = set()
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def _delay(self, size=0):
+        delay = self.latency
+        if self.bandwidth:
+            delay += size / self.bandwidth
+        if delay:
+            time.sleep(delay)
+
+    def bucket_exists(self, bucket_name):
+        self._delay()
+        return bucket_name in self.buckets
+
+    def make_bucket(self, bucket_name):
+        self._delay()
+        self.buckets.add(bucket_name)
+
+    def put_object(self, bucket_name, object_name, data, length, part_size=0, **kwargs):
+        body = data.read() if length < 0 else data.read(length)
+        self._delay(len(body))
+        with self._lock:
+            self.objects[(bucket_name, object_name)] = body
+
+    def fput_object(self, bucket_name, object_name, file_path, **kwargs):
+        with open(file_path, "rb") as f:
+            self.put_object(bucket_name, object_name, f, -1)
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0, **kwargs):
+        with self._lock:
+            data = self.objects[(bucket_name, object_name)]
+        data = data[offset:offset + length] if length else data[offset:]
+        self._delay(len(data))
+        return _Object(data)
+
+    def fget_object(self, bucket_name, object_name, file_path, **kwargs):
+        response = self.get_object(bucket_name, object_name)
+        with open(file_path, "wb") as f:
+            f.write(response.read())
+
+    def stat_object(self, bucket_name, object_name, **kwargs):
+        self._delay()
+        with self._lock:
+            data = self.objects[(bucket_name, object_name)]
+        return type("ObjectStat", (), {
+            "size": len(data), "object_name": object_name,
+            "etag": hashlib.md5(data).hexdigest(), "content_type": None,
+        })()
+
+    def remove_object(self, bucket_name, object_name, **kwargs):
+        self._delay()
+        with self._lock:
+            self.objects.pop((bucket_name, object_name), None)
+
+
+class WhisperStub:
+    """
+    OpenAI /audio/transcriptions 호환 로컬 서버
+
+    latency: 요청당 기본 지연(초), per_second: 오디오 1초당 추가 지연(초),
+    error_rate: 429를 돌려줄 확률 (재시도/백오프 경로 측정용)
+    """
+
+    def __init__(self, latency=0.3, per_second=0.0, error_rate=0.0, host="127.0.0.1", port=0):
+        stub = self
+        self.latency = latency
+        self.per_second = per_second
+        self.error_rate = error_rate
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                # multipart 본문은 읽기만 하고 크기로 오디오 길이를 추정
+                size = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(size)
+                with stub._lock:
+                    stub.requests += 1
+                    throttle = random.random() < stub.error_rate
+                    stub.throttled += throttle
+                if throttle:
+                    self._reply(429, {"error": {"message": "rate limited"}}, {"Retry-After": "0.2"})
+                    return
+                # 16kHz mono 16bit WAV 기준 오디오 길이 (multipart 헤더 크기는 무시할 수준)
+                seconds = size / 32000
+                time.sleep(stub.latency + stub.per_second * seconds)
+                self._reply(200, {"text": f"stub transcript {seconds:.1f}s"})
+
+            def _reply(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
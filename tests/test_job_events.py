@@ -0,0 +1,103 @@
+# /tests/test_job_events.py
+# GET /audio_recording/jobs/{task_id}/events (SSE) 테스트
+# 워커 이벤트는 메모리 브로커(kombu memory://)의 fanout exchange로 전달되고, 결과 저장소도 메모리를 사용한다.
+import os
+import json
+import tempfile
+import threading
+
+os.environ.update({
+    "IS_DOCKER": "true",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_BACKEND_URL": "cache+memory://",
+    "JOB_EVENTS_BACKEND": "broker",
+    "JOB_EVENTS_HEARTBEAT": "0.2",
+    "JOB_EVENTS_STREAM_TIMEOUT": "1",
+    "JWT_SECRET": "test-secret",
+    "DATABASE_URL": f"sqlite:///{tempfile.gettempdir()}/stt_test_job_events.db",
+})
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import audio_recording
+from app.tasks.celery_app import app as celery_app
+from app.utils.verification import create_access_token
+from app.utils.job_events import BrokerEventBus, JobProgress, get_event_bus, get_job_event_hub
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(audio_recording.audio_router, prefix="/audio_recording")
+    get_job_event_hub()  # 메모리 브로커 구독 시작
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def headers():
+    return {"Authorization": f"Bearer {create_access_token({'user_id': 'u1'})}"}
+
+
+def read_events(response):
+    events, keep_alives = [], 0
+    for line in response.iter_lines():
+        if line.startswith("data: "):
+            events.append(json.loads(line[len("data: "):]))
+        elif line.startswith(":"):
+            keep_alives += 1
+    return events, keep_alives
+
+
+def test_requires_auth(client):
+    response = client.get("/audio_recording/jobs/task-auth/events")
+    assert response.status_code == 401
+
+
+def test_streams_worker_events_through_broker(client, headers):
+    assert isinstance(get_event_bus(), BrokerEventBus)
+
+    def worker():
+        progress = JobProgress("task-live")
+        progress.publish("started", file_id="f1")
+        progress.chunk_done(0, 0.0)
+        progress.converted(1, {})
+        progress.done("안녕하세요")
+
+    # 구독이 시작된 뒤 워커가 이벤트를 발행
+    timer = threading.Timer(0.3, worker)
+    timer.start()
+    with client.stream("GET", "/audio_recording/jobs/task-live/events", headers=headers) as response:
+        assert response.status_code == 200
+        events, _ = read_events(response)
+    timer.join()
+
+    assert [e["stage"] for e in events] == ["started", "chunk", "converted", "done"]
+    assert events[-1]["text"] == "안녕하세요"
+
+
+def test_result_backend_checked_once_per_stream(client, headers, monkeypatch):
+    calls = []
+    real_task_result_event = audio_recording.task_result_event
+
+    def counting_task_result_event(task_id):
+        calls.append(task_id)
+        return real_task_result_event(task_id)
+
+    monkeypatch.setattr(audio_recording, "task_result_event", counting_task_result_event)
+
+    # 이벤트가 오지 않는 실행 중 작업: heartbeat 마다 결과 저장소를 조회하지 않고 timeout으로 끝남
+    with client.stream("GET", "/audio_recording/jobs/task-running/events", headers=headers) as response:
+        events, keep_alives = read_events(response)
+    assert [e["stage"] for e in events] == ["timeout"]
+    assert keep_alives >= 2
+    assert calls == ["task-running"]
+
+    # 이미 끝난 작업은 결과 저장소의 상태로 바로 done
+    celery_app.backend.store_result("task-finished", "끝난 작업", "SUCCESS")
+    with client.stream("GET", "/audio_recording/jobs/task-finished/events", headers=headers) as response:
+        events, _ = read_events(response)
+    assert events == [{"task_id": "task-finished", "stage": "done", "ts": events[0]["ts"], "text": "끝난 작업"}]
+    assert calls == ["task-running", "task-finished"]